@@ -1,35 +1,32 @@
-"""
-Run complete metals platform workflow
-"""
-import subprocess
-import sys
-
-scripts = [
-    "scripts/data_processor.py",
-    "scripts/market_commentary.py",
-    "scripts/trade_backtester.py",
-    "scripts/excel_pricing_model.py",
-    "scripts/trade_management.py"
-]
-
-print("="*70)
-print("RUNNING METALS INTELLIGENCE PLATFORM")
-print("="*70)
-
-for script in scripts:
-    print(f"\n▶ Running {script}...")
-    try:
-        subprocess.run([sys.executable, script], check=True)
-        print(f"✓ {script} completed successfully\n")
-    except subprocess.CalledProcessError as e:
-        print(f"✗ {script} failed: {e}\n")
-
-print("="*70)
-print("ALL MODULES COMPLETED")
-print("="*70)
-print("\nCheck the following outputs:")
-print("  • metals_master_data.csv")
-print("  • daily_market_report.pdf")
-print("  • backtest_performance.png")
-print("  • metals_pricing_models.xlsx")
-print("  • trades_export.csv")
\ No newline at end of file
+"""
+Run complete metals platform workflow
+
+All modules run in one interpreter as a dependency graph: the master
+dataset built by data_processor is handed to the commentary and backtest
+stages in memory, while the Excel and trade management stages (which
+don't need it) run alongside. Same as `python scripts/cli.py all`.
+"""
+import matplotlib
+matplotlib.use('Agg')
+
+from scripts.pipeline import build_platform_pipeline
+
+
+if __name__ == "__main__":
+    print("="*70)
+    print("RUNNING METALS INTELLIGENCE PLATFORM")
+    print("="*70)
+
+    pipeline = build_platform_pipeline()
+    pipeline.run()
+
+    print("\n" + "="*70)
+    print("ALL MODULES COMPLETED")
+    print("="*70)
+    pipeline.print_timings()
+    print("\nCheck the following outputs:")
+    print("  • metals_master_data.parquet (+ metals_master_data.csv export)")
+    print("  • daily_market_report.pdf")
+    print("  • backtest_performance.png")
+    print("  • metals_pricing_models.xlsx")
+    print("  • trades_export.csv")
@@ -0,0 +1,317 @@
+"""
+Event-Driven Backtest Engine
+Bar-by-bar simulation with position state, stops/targets and daily MTM equity
+"""
+
+import numpy as np
+import pandas as pd
+
+try:
+    from scripts.master_dataset import MASTER_DATASET, METALS, load_master_dataset
+except ImportError:
+    from master_dataset import MASTER_DATASET, METALS, load_master_dataset
+
+
+class Strategy:
+    """
+    Base class for bar-by-bar strategies
+    
+    series: what the strategy trades; a column name ('copper') or a
+            (long, short) pair traded as the price ratio long/short
+    stop / target: exit when the trade's return reaches -stop / +target
+                   (fractions, e.g. 0.05 = 5%); None disables
+    max_holding: exit after this many bars; None disables
+    
+    Subclasses precompute indicators over the whole price panel in
+    prepare() and answer on_bar() with the target direction per series
+    (+1 long, -1 short, 0 flat). The engine owns position state, stops,
+    targets and valuation.
+    """
+    
+    def __init__(self, series, stop=None, target=None, max_holding=None, name=None):
+        self.series = list(series)
+        self.stop = stop
+        self.target = target
+        self.max_holding = max_holding
+        self.name = name or type(self).__name__
+    
+    def prepare(self, prices, dates):
+        """Precompute indicators; prices is an (n_bars, n_series) array"""
+    
+    def on_bar(self, i, position):
+        """
+        Target direction for each series at bar i
+        
+        position: current direction per series (read-only)
+        """
+        raise NotImplementedError
+
+
+class MomentumStrategy(Strategy):
+    """
+    Long while price is above its moving average, flat (or short with
+    allow_short) below it
+    """
+    
+    def __init__(self, metals=METALS, lookback=20, max_holding=60, stop=None, target=None,
+                 allow_short=False, name=None):
+        super().__init__(metals, stop=stop, target=target, max_holding=max_holding,
+                         name=name or f'momentum_{lookback}')
+        self.lookback = lookback
+        self.allow_short = allow_short
+    
+    def prepare(self, prices, dates):
+        ma = pd.DataFrame(prices).rolling(self.lookback).mean().to_numpy()
+        with np.errstate(invalid='ignore'):
+            signals = np.where(prices > ma, 1, -1 if self.allow_short else 0)
+        signals[np.isnan(ma)] = 0
+        self.signals = signals.astype(np.int8)
+    
+    def on_bar(self, i, position):
+        return self.signals[i]
+
+
+class SpreadStrategy(Strategy):
+    """
+    Mean reversion on price ratios: long the ratio when its rolling
+    z-score is below -entry_z, short above +entry_z, exit once it has
+    reverted through exit_z
+    """
+    
+    def __init__(self, pairs=(('copper', 'aluminum'),), window=60, entry_z=1.0, exit_z=0.0,
+                 max_holding=40, stop=None, target=None, name=None):
+        super().__init__([tuple(pair) for pair in pairs], stop=stop, target=target,
+                         max_holding=max_holding, name=name or f'spread_{window}')
+        self.window = window
+        self.entry_z = entry_z
+        self.exit_z = exit_z
+    
+    def prepare(self, prices, dates):
+        rolling = pd.DataFrame(prices).rolling(self.window)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.z_scores = ((prices - rolling.mean().to_numpy()) / rolling.std().to_numpy())
+    
+    def on_bar(self, i, position):
+        z = self.z_scores[i]
+        entry = np.where(z > self.entry_z, -1, np.where(z < -self.entry_z, 1, 0))
+        hold = np.where(position > 0, z < -self.exit_z, z > self.exit_z)
+        return np.where(position == 0, entry, np.where(hold, position, 0))
+
+
+class EventBacktester:
+    """
+    Bar-by-bar backtest of one or more strategies on the master dataset
+    
+    Every (strategy, series) pair is a position slot; all slots are held
+    in preallocated NumPy arrays and processed together on each bar, so
+    the per-bar Python work is one callback per strategy. Each slot is
+    allocated capital / len(strategy.series) at entry (fixed quantity),
+    and every strategy's equity starts at 1.0 and is marked to market
+    daily at the close.
+    
+    Order of events on each bar: mark open positions to the close, apply
+    stop/target/time exits, then ask each strategy for target directions
+    (signal exits, reversals and new entries fill at the same close).
+    A slot stopped out on a bar cannot re-enter until the next bar.
+    """
+    
+    def __init__(self, data_file=MASTER_DATASET, df=None):
+        self.df = df if df is not None else load_master_dataset(data_file)
+        self.strategies = []
+    
+    def add_strategy(self, strategy):
+        """Register a strategy; names must be unique"""
+        if any(existing.name == strategy.name for existing in self.strategies):
+            raise ValueError(f"Duplicate strategy name: {strategy.name}")
+        self.strategies.append(strategy)
+        return self
+    
+    def _series_prices(self, series):
+        """Price (or long/short ratio) array for one traded series"""
+        if isinstance(series, tuple):
+            long_leg, short_leg = series
+            return self.df[long_leg].to_numpy(dtype=np.float64) / \
+                self.df[short_leg].to_numpy(dtype=np.float64)
+        return self.df[series].to_numpy(dtype=np.float64)
+    
+    @staticmethod
+    def _series_name(series):
+        return '/'.join(series) if isinstance(series, tuple) else series
+    
+    def run(self):
+        """
+        Simulate every registered strategy
+        
+        Returns a dict of DataFrames indexed by date with one column per
+        strategy ('equity', 'pnl', 'exposure', 'turnover') plus 'trades',
+        one row per closed trade. Positions still open on the last bar are
+        closed there with exit_reason 'end'.
+        """
+        if not self.strategies:
+            raise ValueError("No strategies registered")
+        
+        dates = self.df['date'].to_numpy(dtype='datetime64[ns]')
+        n_bars, n_strategies = len(dates), len(self.strategies)
+        
+        # Price panel and per-slot parameters, strategies side by side
+        panels, slices, slot_strategy = [], [], []
+        stop, target, max_holding, weight = [], [], [], []
+        for s, strategy in enumerate(self.strategies):
+            prices = np.column_stack([self._series_prices(series) for series in strategy.series])
+            prices = pd.DataFrame(prices).ffill().to_numpy()
+            strategy.prepare(prices, dates)
+            
+            k = len(strategy.series)
+            start = sum(panel.shape[1] for panel in panels)
+            panels.append(prices)
+            slices.append(slice(start, start + k))
+            slot_strategy += [s] * k
+            stop += [np.inf if strategy.stop is None else strategy.stop] * k
+            target += [np.inf if strategy.target is None else strategy.target] * k
+            max_holding += [n_bars if strategy.max_holding is None else strategy.max_holding] * k
+            weight += [1.0 / k] * k
+        
+        panel = np.ascontiguousarray(np.hstack(panels))
+        slot_strategy = np.array(slot_strategy)
+        stop, target = np.array(stop), np.array(target)
+        max_holding, weight = np.array(max_holding), np.array(weight)
+        n_slots = panel.shape[1]
+        
+        # Position state
+        direction = np.zeros(n_slots, dtype=np.int8)
+        entry_idx = np.full(n_slots, -1)
+        entry_price = np.full(n_slots, np.nan)
+        quantity = np.zeros(n_slots)
+        targets = np.zeros(n_slots, dtype=np.int8)
+        
+        pnl = np.zeros((n_bars, n_strategies))
+        exposure = np.zeros((n_bars, n_strategies))
+        turnover = np.zeros((n_bars, n_strategies))
+        closed = []
+        
+        def close(slots, i, reasons):
+            for slot, reason in zip(slots, reasons):
+                closed.append((slot, entry_idx[slot], i, direction[slot],
+                               entry_price[slot], panel[i, slot], reason))
+            turnover[i] += np.bincount(slot_strategy[slots], weight[slots], n_strategies)
+            direction[slots] = 0
+            quantity[slots] = 0.0
+        
+        for i in range(n_bars):
+            price = panel[i]
+            if i > 0:
+                move = quantity * direction * (price - panel[i - 1])
+                pnl[i] = np.bincount(slot_strategy, np.nan_to_num(move), n_strategies)
+            
+            is_open = direction != 0
+            risk_exit = np.zeros(n_slots, dtype=bool)
+            if is_open.any():
+                with np.errstate(invalid='ignore'):
+                    trade_return = direction * (price / entry_price - 1)
+                    hit_stop = is_open & (trade_return <= -stop)
+                    hit_target = is_open & (trade_return >= target)
+                timed_out = is_open & (i - entry_idx >= max_holding)
+                risk_exit = hit_stop | hit_target | timed_out
+                if risk_exit.any():
+                    slots = np.flatnonzero(risk_exit)
+                    reasons = np.where(hit_stop[slots], 'stop',
+                                       np.where(hit_target[slots], 'target', 'time'))
+                    close(slots, i, reasons)
+            
+            for strategy, slot_range in zip(self.strategies, slices):
+                targets[slot_range] = strategy.on_bar(i, direction[slot_range])
+            
+            signal_exit = (direction != 0) & (targets != direction)
+            if signal_exit.any():
+                slots = np.flatnonzero(signal_exit)
+                close(slots, i, ['signal'] * len(slots))
+            
+            entries = (direction == 0) & (targets != 0) & ~risk_exit & np.isfinite(price)
+            if entries.any():
+                direction[entries] = targets[entries]
+                entry_idx[entries] = i
+                entry_price[entries] = price[entries]
+                quantity[entries] = weight[entries] / price[entries]
+                turnover[i] += np.bincount(slot_strategy[entries], weight[entries], n_strategies)
+            
+            exposure[i] = np.bincount(slot_strategy, weight * (direction != 0), n_strategies)
+        
+        still_open = np.flatnonzero(direction != 0)
+        if len(still_open):
+            close(still_open, n_bars - 1, ['end'] * len(still_open))
+        
+        names = [strategy.name for strategy in self.strategies]
+        index = pd.DatetimeIndex(dates, name='date')
+        
+        return {
+            'equity': pd.DataFrame(1.0 + np.cumsum(pnl, axis=0), index=index, columns=names),
+            'pnl': pd.DataFrame(pnl, index=index, columns=names),
+            'exposure': pd.DataFrame(exposure, index=index, columns=names),
+            'turnover': pd.DataFrame(turnover, index=index, columns=names),
+            'trades': self._trades_frame(closed, slot_strategy, weight, dates),
+        }
+    
+    def _trades_frame(self, closed, slot_strategy, weight, dates):
+        """Closed trades in the column layout of TradeBacktester's trade logs"""
+        series_names = [self._series_name(series)
+                        for strategy in self.strategies for series in strategy.series]
+        columns = ['strategy', 'series', 'direction', 'entry_date', 'entry_price', 'exit_date',
+                   'exit_price', 'return', 'holding_days', 'bars', 'exit_reason', 'pnl']
+        if not closed:
+            return pd.DataFrame(columns=columns)
+        
+        slot, entry_i, exit_i, direction, entry_price, exit_price, reason = map(np.array, zip(*closed))
+        order = np.lexsort((slot, exit_i))
+        slot, entry_i, exit_i = slot[order], entry_i[order], exit_i[order]
+        direction, entry_price, exit_price = direction[order], entry_price[order], exit_price[order]
+        
+        trade_return = direction * (exit_price / entry_price - 1)
+        entry_dates = pd.DatetimeIndex(dates[entry_i])
+        exit_dates = pd.DatetimeIndex(dates[exit_i])
+        
+        return pd.DataFrame({
+            'strategy': [self.strategies[s].name for s in slot_strategy[slot]],
+            'series': [series_names[s] for s in slot],
+            'direction': np.where(direction > 0, 'Long', 'Short'),
+            'entry_date': entry_dates,
+            'entry_price': entry_price,
+            'exit_date': exit_dates,
+            'exit_price': exit_price,
+            'return': trade_return * 100,
+            'holding_days': (exit_dates - entry_dates).days.to_numpy(dtype=np.int64),
+            'bars': exit_i - entry_i,
+            'exit_reason': reason[order],
+            'pnl': trade_return * weight[slot],
+        })
+
+
+# Example usage
+if __name__ == "__main__":
+    engine = EventBacktester()
+    engine.add_strategy(MomentumStrategy(lookback=20, max_holding=60, stop=0.08, target=0.15))
+    engine.add_strategy(SpreadStrategy(pairs=[('copper', 'aluminum'), ('gold', 'silver')],
+                                       window=60, entry_z=1.5, stop=0.05))
+    
+    results = engine.run()
+    
+    try:
+        from scripts.performance_metrics import equity_metrics
+    except ImportError:
+        from performance_metrics import equity_metrics
+    metrics = equity_metrics(results['equity'], exposure=results['exposure'],
+                             turnover=results['turnover'])
+    
+    print("\n" + "="*60)
+    print("EVENT-DRIVEN BACKTEST")
+    print("="*60)
+    for name in results['equity'].columns:
+        trades = results['trades'][results['trades']['strategy'] == name]
+        print(f"\n{name}")
+        print(f"  Final equity:   {results['equity'][name].iloc[-1]:.3f}")
+        print(f"  Trades:         {len(trades)}")
+        print(f"  Avg exposure:   {results['exposure'][name].mean():.1%}")
+        print(f"  Exit reasons:   {trades['exit_reason'].value_counts().to_dict()}")
+        print(f"  Sharpe:         {metrics.loc[name, 'sharpe_ratio']:.2f}")
+        print(f"  Sortino:        {metrics.loc[name, 'sortino_ratio']:.2f}")
+        print(f"  Max drawdown:   {metrics.loc[name, 'max_drawdown']:.1%} "
+              f"({metrics.loc[name, 'max_drawdown_duration']:.0f} days)")
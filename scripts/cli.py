@@ -0,0 +1,146 @@
+"""
+Metals Platform Command Line
+One entry point for every module; each subcommand imports only what it needs
+
+    python scripts/cli.py data
+    python scripts/cli.py commentary
+    python scripts/cli.py backtest
+    python scripts/cli.py pairs [--fx] [--window 60] [--lookback 504] [--significance 0.05]
+    python scripts/cli.py excel
+    python scripts/cli.py trades [--journal data/trade_journal]
+    python scripts/cli.py blotter --journal data/trade_journal
+    python scripts/cli.py summary --journal data/trade_journal
+    python scripts/cli.py all
+"""
+
+import argparse
+import os
+import sys
+
+try:
+    from scripts.pipeline import import_script
+except ImportError:
+    from pipeline import import_script
+
+
+def run_data(args):
+    import_script('data_processor').main(cache_dir=args.cache_dir)
+
+
+def run_commentary(args):
+    import_script('market_commentary').main()
+
+
+def run_backtest(args):
+    import_script('trade_backtester').main()
+
+
+def run_pairs(args):
+    scanner = import_script('pairs_scanner')
+    try:
+        ranked = scanner.scan_pairs(import_script('master_dataset').load_master_dataset(),
+                                    fx_adjusted=args.fx, window=args.window, lookback=args.lookback,
+                                    significance=args.significance,
+                                    cross_currency=args.cross_currency)
+    except ValueError as error:
+        sys.exit(f"✗ {error}")
+    print(ranked.head(args.top).round(3).to_string())
+
+
+def run_excel(args):
+    import_script('excel_pricing_model').main()
+
+
+def run_trades(args):
+    import_script('trade_management').main(journal_dir=args.journal)
+
+
+def open_journal(journal_dir):
+    """
+    TradeManagementSystem over an existing journal, or None (read-only
+    queries must not create an empty journal directory)
+    """
+    if not os.path.isdir(journal_dir):
+        print(f"No trades in system (no journal at {journal_dir})")
+        return None
+    return import_script('trade_management').TradeManagementSystem(journal_dir=journal_dir)
+
+
+def run_blotter(args):
+    tms = open_journal(args.journal)
+    if tms is None:
+        return
+    blotter = tms.generate_trade_blotter()
+    if len(blotter):
+        print(blotter.to_string(index=False))
+    tms.close()
+
+
+def run_summary(args):
+    tms = open_journal(args.journal)
+    if tms is None:
+        return
+    if len(tms.store):
+        tms.print_portfolio_summary()
+    else:
+        print("No trades in system")
+    tms.close()
+
+
+def run_all(args):
+    import matplotlib
+    matplotlib.use('Agg')
+    
+    pipeline = import_script('pipeline').build_platform_pipeline(max_workers=args.workers)
+    pipeline.run()
+    pipeline.print_timings()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='cli.py', description='Metals Intelligence Platform')
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    data = commands.add_parser('data', help='download prices and build the master dataset')
+    data.add_argument('--cache-dir', default='data/price_cache')
+    data.set_defaults(func=run_data)
+    
+    commands.add_parser('commentary', help='daily snapshot, commentary and PDF report') \
+        .set_defaults(func=run_commentary)
+    commands.add_parser('backtest', help='momentum and spread backtests') \
+        .set_defaults(func=run_backtest)
+    pairs = commands.add_parser('pairs', help='rank metal pairs by z-score and cointegration')
+    pairs.add_argument('--fx', action='store_true', help='include usdcnh/usdinr-adjusted series')
+    pairs.add_argument('--window', type=int, default=60)
+    pairs.add_argument('--lookback', type=int, default=504)
+    pairs.add_argument('--top', type=int, default=20)
+    pairs.add_argument('--significance', type=float, default=0.05,
+                       help='cointegration test level: 0.01, 0.05 or 0.10')
+    pairs.add_argument('--cross-currency', action='store_true',
+                       help='with --fx, also pair series quoted in different currencies')
+    pairs.set_defaults(func=run_pairs)
+    commands.add_parser('excel', help='Excel pricing models') \
+        .set_defaults(func=run_excel)
+    trades = commands.add_parser('trades', help='sample trade lifecycle and blotter export')
+    trades.add_argument('--journal', default=None, help='also persist the trades to this journal')
+    trades.set_defaults(func=run_trades)
+    
+    for name, func, help_text in (('blotter', run_blotter, 'print the trade blotter'),
+                                  ('summary', run_summary, 'print the portfolio summary')):
+        command = commands.add_parser(name, help=f'{help_text} from a trade journal')
+        command.add_argument('--journal', default='data/trade_journal')
+        command.set_defaults(func=func)
+    
+    everything = commands.add_parser('all', help='run the whole platform pipeline')
+    everything.add_argument('--workers', type=int, default=4)
+    everything.set_defaults(func=run_all)
+    
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
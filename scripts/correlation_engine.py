@@ -0,0 +1,225 @@
+"""
+Rolling Correlation & Beta Engine
+Correlation and beta matrices for every day and several windows in one pass
+"""
+
+import numpy as np
+import pandas as pd
+
+try:
+    from scripts.master_dataset import METALS
+except ImportError:
+    from master_dataset import METALS
+
+FACTORS = ['dxy', 'china_pmi', 'usdcnh', 'usdinr']
+WINDOWS = (30, 90, 250)
+
+# Days of matrices computed per block in fit()
+BLOCK_DAYS = 512
+
+
+class RollingCorrelationEngine:
+    """
+    Rolling correlation and beta matrices over sliding windows
+    
+    For each window the engine keeps four k x k cross-product sums over
+    the rows currently in the window (pairwise observation counts, sums,
+    sums of squares and cross products), so missing values are handled
+    pair by pair like DataFrame.corr(). fit() produces the sums for every
+    day at once as differences of cumulative sums; append() slides them
+    forward one day by adding the new row and subtracting the one that
+    left. No per-day .corr() is needed for any window.
+    
+    Results are float32 arrays of shape (n_days, k, k) per window:
+    correlations[w][t, i, j] and betas[w][t, i, j] (beta of series i on
+    series j, cov_ij / var_j). They are views into buffers that double
+    in capacity when full, so append() never copies the history.
+    """
+    
+    def __init__(self, windows=WINDOWS, min_periods=None):
+        """
+        min_periods: pairwise observations a window needs for a value
+                     (default: the full window)
+        """
+        self.windows = tuple(sorted(windows))
+        self.min_periods = min_periods
+        self.on = 'returns'
+        self.columns = []
+        self._length = 0
+        self._dates = np.empty(0, dtype='datetime64[ns]')
+        self._correlations = {}
+        self._betas = {}
+    
+    @property
+    def dates(self):
+        return pd.DatetimeIndex(self._dates[:self._length])
+    
+    @property
+    def correlations(self):
+        return {window: values[:self._length] for window, values in self._correlations.items()}
+    
+    @property
+    def betas(self):
+        return {window: values[:self._length] for window, values in self._betas.items()}
+    
+    def _reserve(self, length):
+        """Grow the result buffers (doubling) to hold at least length days"""
+        capacity = len(self._dates)
+        if length <= capacity:
+            return
+        capacity = max(length, 2 * capacity, 16)
+        
+        def grown(values):
+            buffer = np.empty((capacity,) + values.shape[1:], dtype=values.dtype)
+            buffer[:self._length] = values[:self._length]
+            return buffer
+        
+        self._dates = grown(self._dates)
+        for arrays in (self._correlations, self._betas):
+            for window in arrays:
+                arrays[window] = grown(arrays[window])
+    
+    def _transform(self, raw, previous=None):
+        """Values the engine correlates: price levels, or simple returns"""
+        if self.on == 'levels':
+            return raw
+        previous = np.vstack([np.full((1, raw.shape[1]), np.nan) if previous is None
+                              else previous[None, :], raw[:-1]])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return raw / previous - 1.0
+    
+    @staticmethod
+    def _cross_products(values):
+        """Per-row outer products (n, 4, k, k) of counts, sums, squares, products"""
+        present = ~np.isnan(values)
+        filled = np.where(present, values, 0.0)
+        mask = present.astype(np.float64)
+        return np.stack([
+            np.einsum('ti,tj->tij', mask, mask),
+            np.einsum('ti,tj->tij', filled, mask),
+            np.einsum('ti,tj->tij', filled * filled, mask),
+            np.einsum('ti,tj->tij', filled, filled),
+        ], axis=1)
+    
+    def _matrices(self, sums, window):
+        """Correlation and beta matrices (..., k, k) from window sums"""
+        count, total, squares, products = (sums[..., s, :, :] for s in range(4))
+        total_t = np.swapaxes(total, -1, -2)
+        squares_t = np.swapaxes(squares, -1, -2)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = products - total * total_t / count
+            var_i = squares - total ** 2 / count
+            var_j = squares_t - total_t ** 2 / count
+            correlation = cov / np.sqrt(var_i * var_j)
+            beta = cov / var_j
+        
+        min_periods = self.min_periods or window
+        short = count < max(min_periods, 2)
+        correlation[short] = np.nan
+        beta[short] = np.nan
+        return np.clip(correlation, -1.0, 1.0).astype(np.float32), beta.astype(np.float32)
+    
+    def fit(self, df, columns=None, on='returns'):
+        """
+        Compute every day's matrices for all windows
+        
+        columns: series to correlate (default: metals and macro/FX factors
+                 present in df)
+        on: 'returns' (daily simple returns) or 'levels'
+        """
+        if on not in ('returns', 'levels'):
+            raise ValueError(f"on must be 'returns' or 'levels', not {on!r}")
+        self.on = on
+        self.columns = list(columns or [c for c in METALS + FACTORS if c in df])
+        self._length = len(df)
+        self._dates = pd.DatetimeIndex(df['date']).to_numpy(dtype='datetime64[ns]').copy()
+        
+        raw = df[self.columns].to_numpy(dtype=np.float64)
+        values = self._transform(raw)
+        
+        # Centre each series so the running sums stay small
+        self._offset = np.nan_to_num(np.nanmean(values, axis=0))
+        values = values - self._offset
+        
+        # Cumulative sums in place; each window's sums are differences of
+        # them, evaluated in blocks of days to bound the temporaries
+        cumulative = self._cross_products(values)
+        np.cumsum(cumulative, axis=0, out=cumulative)
+        
+        n, k = values.shape
+        self._sums = {}
+        for window in self.windows:
+            self._correlations[window] = np.empty((n, k, k), dtype=np.float32)
+            self._betas[window] = np.empty((n, k, k), dtype=np.float32)
+            for start in range(0, n, BLOCK_DAYS):
+                stop = min(start + BLOCK_DAYS, n)
+                sums = cumulative[start:stop].copy()
+                sliding = max(start, window)
+                if sliding < stop:
+                    sums[sliding - start:] -= cumulative[sliding - window:stop - window]
+                self._correlations[window][start:stop], self._betas[window][start:stop] = \
+                    self._matrices(sums, window)
+            self._sums[window] = sums[-1].copy()
+        
+        # Rows that will leave the windows as new days are appended
+        self._recent = values[-self.windows[-1]:].copy()
+        self._last_raw = raw[-1].copy()
+        return self
+    
+    def append(self, row):
+        """
+        Slide every window forward by one day
+        
+        row: mapping (e.g. a master-dataset row) with 'date' and the
+             engine's columns
+        """
+        raw = np.array([row[column] for column in self.columns], dtype=np.float64)
+        values = self._transform(raw[None, :], self._last_raw)[0] - self._offset
+        incoming = self._cross_products(values[None, :])[0]
+        self._reserve(self._length + 1)
+        
+        for window in self.windows:
+            sums = self._sums[window] + incoming
+            if len(self._recent) >= window:
+                sums -= self._cross_products(self._recent[-window][None, :])[0]
+            self._sums[window] = sums
+            self._correlations[window][self._length], self._betas[window][self._length] = \
+                self._matrices(sums, window)
+        
+        self._recent = np.vstack([self._recent, values[None, :]])[-self.windows[-1]:]
+        self._last_raw = raw
+        self._dates[self._length] = np.datetime64(pd.Timestamp(row['date']), 'ns')
+        self._length += 1
+        return self
+    
+    def matrix(self, window, date=None, kind='correlation'):
+        """k x k DataFrame for one day (default: the latest)"""
+        arrays = self._correlations if kind == 'correlation' else self._betas
+        index = self._length - 1 if date is None else self.dates.get_loc(pd.Timestamp(date))
+        return pd.DataFrame(arrays[window][index].astype(np.float64),
+                            index=self.columns, columns=self.columns)
+    
+    def series(self, first, second, window, kind='correlation'):
+        """Daily correlation (or beta of first on second) as a Series"""
+        arrays = self.correlations if kind == 'correlation' else self.betas
+        i, j = self.columns.index(first), self.columns.index(second)
+        return pd.Series(arrays[window][:, i, j].astype(np.float64), index=self.dates,
+                         name=f'{first}_{second}_{kind}_{window}d')
+
+
+# Example usage
+if __name__ == "__main__":
+    try:
+        from scripts.master_dataset import load_master_dataset
+    except ImportError:
+        from master_dataset import load_master_dataset
+    
+    engine = RollingCorrelationEngine().fit(load_master_dataset())
+    
+    print("\n" + "="*60)
+    print("ROLLING CORRELATIONS (daily returns, latest day)")
+    print("="*60)
+    for window in engine.windows:
+        print(f"\n{window}D")
+        print(engine.matrix(window).loc[METALS, [f for f in FACTORS if f in engine.columns]].round(2))
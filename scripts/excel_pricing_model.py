@@ -1,315 +1,516 @@
-"""
-Excel Pricing & Payoff Model Generator
-Creates professional Excel models for trade analysis
-"""
-
-import pandas as pd
-import numpy as np
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.chart import LineChart, Reference, BarChart
-from openpyxl.utils.dataframe import dataframe_to_rows
-
-class ExcelPricingModel:
-    """
-    Generate Excel pricing models with formulas and charts
-    """
-    
-    def __init__(self):
-        self.wb = Workbook()
-        
-    def create_directional_trade_model(self, 
-                                      trade_name="Long Copper",
-                                      entry_price=8650,
-                                      target_price=9200,
-                                      stop_price=8400,
-                                      notional=1000000):
-        """
-        Create directional trade pricing model
-        """
-        ws = self.wb.active
-        ws.title = "Directional Trade"
-        
-        # Header
-        ws['A1'] = 'DIRECTIONAL TRADE PRICING MODEL'
-        ws['A1'].font = Font(size=16, bold=True, color='FFFFFF')
-        ws['A1'].fill = PatternFill(start_color='1e3a8a', end_color='1e3a8a', fill_type='solid')
-        ws.merge_cells('A1:F1')
-        ws['A1'].alignment = Alignment(horizontal='center', vertical='center')
-        ws.row_dimensions[1].height = 30
-        
-        # Trade parameters
-        ws['A3'] = 'TRADE PARAMETERS'
-        ws['A3'].font = Font(bold=True, size=12)
-        
-        params = [
-            ['Trade Name:', trade_name],
-            ['Entry Price:', entry_price],
-            ['Target Price:', target_price],
-            ['Stop Loss:', stop_price],
-            ['Notional (USD):', notional],
-            ['', ''],
-            ['Risk/Reward:', '=ABS((C6-C5)/(C7-C5))'],
-            ['Max Profit:', '=(C6-C5)/C5'],
-            ['Max Loss:', '=(C7-C5)/C5']
-        ]
-        
-        for i, (label, value) in enumerate(params, start=4):
-            ws[f'A{i}'] = label
-            ws[f'A{i}'].font = Font(bold=True)
-            ws[f'C{i}'] = value
-            if i >= 11:
-                ws[f'C{i}'].number_format = '0.00%'
-        
-        # Price scenarios
-        ws['A15'] = 'SCENARIO ANALYSIS'
-        ws['A15'].font = Font(bold=True, size=12)
-        
-        # Headers
-        headers = ['Price', '% Change', 'P&L ($)', 'Return %', 'Status']
-        for col, header in enumerate(headers, start=1):
-            cell = ws.cell(row=16, column=col)
-            cell.value = header
-            cell.font = Font(bold=True, color='FFFFFF')
-            cell.fill = PatternFill(start_color='2563eb', end_color='2563eb', fill_type='solid')
-            cell.alignment = Alignment(horizontal='center')
-        
-        # Price scenarios
-        prices = np.arange(entry_price - 500, entry_price + 800, 100)
-        
-        for i, price in enumerate(prices, start=17):
-            ws[f'A{i}'] = price
-            ws[f'B{i}'] = f'=(A{i}-$C$5)/$C$5'
-            ws[f'C{i}'] = f'=(A{i}-$C$5)*($C$8/$C$5)'
-            ws[f'D{i}'] = f'=C{i}/$C$8'
-            ws[f'E{i}'] = (f'=IF(A{i}>=$C$6,"TARGET",IF(A{i}<=$C$7,"STOP","ACTIVE"))')
-            
-            # Formatting
-            ws[f'B{i}'].number_format = '0.00%'
-            ws[f'C{i}'].number_format = '$#,##0'
-            ws[f'D{i}'].number_format = '0.00%'
-        
-        # Conditional formatting colors
-        for i in range(17, 17 + len(prices)):
-            for col in ['C', 'D']:
-                cell = ws[f'{col}{i}']
-                if col == 'C':
-                    # Color based on P&L
-                    if i == 17:  # We'll color later based on actual values
-                        pass
-        
-        # Payoff chart
-        chart = LineChart()
-        chart.title = "P&L Payoff Diagram"
-        chart.style = 10
-        chart.y_axis.title = 'P&L ($)'
-        chart.x_axis.title = 'Copper Price'
-        
-        data = Reference(ws, min_col=3, min_row=16, max_row=16+len(prices))
-        cats = Reference(ws, min_col=1, min_row=17, max_row=16+len(prices))
-        chart.add_data(data, titles_from_data=True)
-        chart.set_categories(cats)
-        
-        ws.add_chart(chart, "G3")
-        
-        # Column widths
-        ws.column_dimensions['A'].width = 15
-        ws.column_dimensions['B'].width = 12
-        ws.column_dimensions['C'].width = 15
-        ws.column_dimensions['D'].width = 12
-        ws.column_dimensions['E'].width = 12
-        
-        print("✓ Created directional trade model")
-    
-    def create_spread_trade_model(self,
-                                 metal1="Copper",
-                                 metal2="Aluminum",
-                                 entry_ratio=3.76,
-                                 target_ratio=4.00,
-                                 stop_ratio=3.60,
-                                 notional=500000):
-        """
-        Create spread trade pricing model
-        """
-        ws = self.wb.create_sheet("Spread Trade")
-        
-        # Header
-        ws['A1'] = 'SPREAD TRADE PRICING MODEL'
-        ws['A1'].font = Font(size=16, bold=True, color='FFFFFF')
-        ws['A1'].fill = PatternFill(start_color='10b981', end_color='10b981', fill_type='solid')
-        ws.merge_cells('A1:F1')
-        ws['A1'].alignment = Alignment(horizontal='center', vertical='center')
-        ws.row_dimensions[1].height = 30
-        
-        # Trade parameters
-        ws['A3'] = 'SPREAD PARAMETERS'
-        ws['A3'].font = Font(bold=True, size=12)
-        
-        params = [
-            ['Long:', metal1],
-            ['Short:', metal2],
-            ['Entry Ratio:', entry_ratio],
-            ['Target Ratio:', target_ratio],
-            ['Stop Ratio:', stop_ratio],
-            ['Notional (USD):', notional],
-            ['', ''],
-            ['Upside:', '=(C7-C6)/C6'],
-            ['Downside:', '=(C8-C6)/C6']
-        ]
-        
-        for i, (label, value) in enumerate(params, start=4):
-            ws[f'A{i}'] = label
-            ws[f'A{i}'].font = Font(bold=True)
-            ws[f'C{i}'] = value
-            if i >= 11:
-                ws[f'C{i}'].number_format = '0.00%'
-        
-        # Spread scenarios
-        ws['A15'] = 'SPREAD SCENARIO ANALYSIS'
-        ws['A15'].font = Font(bold=True, size=12)
-        
-        headers = ['Spread Ratio', '% from Entry', 'P&L ($)', 'Return %']
-        for col, header in enumerate(headers, start=1):
-            cell = ws.cell(row=16, column=col)
-            cell.value = header
-            cell.font = Font(bold=True, color='FFFFFF')
-            cell.fill = PatternFill(start_color='10b981', end_color='10b981', fill_type='solid')
-            cell.alignment = Alignment(horizontal='center')
-        
-        # Spread ratios
-        ratios = np.arange(3.4, 4.3, 0.1)
-        
-        for i, ratio in enumerate(ratios, start=17):
-            ws[f'A{i}'] = round(ratio, 2)
-            ws[f'B{i}'] = f'=(A{i}-$C$6)/$C$6'
-            ws[f'C{i}'] = f'=(A{i}-$C$6)/$C$6*$C$9'
-            ws[f'D{i}'] = f'=C{i}/$C$9'
-            
-            ws[f'B{i}'].number_format = '0.00%'
-            ws[f'C{i}'].number_format = '$#,##0'
-            ws[f'D{i}'].number_format = '0.00%'
-        
-        # Chart
-        chart = LineChart()
-        chart.title = "Spread P&L Profile"
-        chart.style = 12
-        chart.y_axis.title = 'P&L ($)'
-        chart.x_axis.title = f'{metal1}/{metal2} Ratio'
-        
-        data = Reference(ws, min_col=3, min_row=16, max_row=16+len(ratios))
-        cats = Reference(ws, min_col=1, min_row=17, max_row=16+len(ratios))
-        chart.add_data(data, titles_from_data=True)
-        chart.set_categories(cats)
-        
-        ws.add_chart(chart, "G3")
-        
-        print("✓ Created spread trade model")
-    
-    def create_option_payoff_model(self,
-                                  option_type="Call",
-                                  strike=8800,
-                                  premium=150,
-                                  notional=1000000):
-        """
-        Create option payoff model (conceptual)
-        """
-        ws = self.wb.create_sheet("Option Payoff")
-        
-        # Header
-        ws['A1'] = f'{option_type.upper()} OPTION PAYOFF MODEL'
-        ws['A1'].font = Font(size=16, bold=True, color='FFFFFF')
-        ws['A1'].fill = PatternFill(start_color='eab308', end_color='eab308', fill_type='solid')
-        ws.merge_cells('A1:E1')
-        ws['A1'].alignment = Alignment(horizontal='center')
-        ws.row_dimensions[1].height = 30
-        
-        # Parameters
-        ws['A3'] = 'OPTION PARAMETERS'
-        ws['A3'].font = Font(bold=True, size=12)
-        
-        params = [
-            ['Type:', option_type],
-            ['Strike Price:', strike],
-            ['Premium Paid:', premium],
-            ['Notional:', notional],
-            ['Break-even:', f'=$C$5+$C$6' if option_type == 'Call' else f'=$C$5-$C$6']
-        ]
-        
-        for i, (label, value) in enumerate(params, start=4):
-            ws[f'A{i}'] = label
-            ws[f'A{i}'].font = Font(bold=True)
-            ws[f'C{i}'] = value
-        
-        # Payoff table
-        ws['A11'] = 'PAYOFF ANALYSIS'
-        ws['A11'].font = Font(bold=True, size=12)
-        
-        headers = ['Spot Price', 'Intrinsic Value', 'Net P&L', 'Return %']
-        for col, header in enumerate(headers, start=1):
-            cell = ws.cell(row=12, column=col)
-            cell.value = header
-            cell.font = Font(bold=True, color='FFFFFF')
-            cell.fill = PatternFill(start_color='eab308', end_color='eab308', fill_type='solid')
-        
-        prices = np.arange(strike - 600, strike + 800, 100)
-        
-        for i, price in enumerate(prices, start=13):
-            ws[f'A{i}'] = price
-            if option_type == 'Call':
-                ws[f'B{i}'] = f'=MAX(A{i}-$C$5,0)'
-            else:
-                ws[f'B{i}'] = f'=MAX($C$5-A{i},0)'
-            ws[f'C{i}'] = f'=B{i}-$C$6'
-            ws[f'D{i}'] = f'=C{i}/$C$6'
-            
-            ws[f'C{i}'].number_format = '$#,##0'
-            ws[f'D{i}'].number_format = '0.00%'
-        
-        print(f"✓ Created {option_type} option model")
-    
-    def save(self, filename='metals_pricing_models.xlsx'):
-        """
-        Save Excel workbook
-        """
-        self.wb.save(filename)
-        print(f"\n✓ Saved Excel pricing models: {filename}")
-
-
-# Example usage
-if __name__ == "__main__":
-    excel = ExcelPricingModel()
-    
-    # Create all models
-    excel.create_directional_trade_model(
-        trade_name="Long Copper",
-        entry_price=8650,
-        target_price=9200,
-        stop_price=8400,
-        notional=1000000
-    )
-    
-    excel.create_spread_trade_model(
-        metal1="Copper",
-        metal2="Aluminum",
-        entry_ratio=3.76,
-        target_ratio=4.00,
-        stop_ratio=3.60,
-        notional=500000
-    )
-    
-    excel.create_option_payoff_model(
-        option_type="Call",
-        strike=8800,
-        premium=150,
-        notional=1000000
-    )
-    
-    excel.save()
-    
-    print("\n" + "="*60)
-    print("Excel models created with:")
-    print("  • Dynamic formulas for P&L calculation")
-    print("  • Scenario analysis tables")
-    print("  • Professional charts")
-    print("  • Risk metrics")
-    print("="*60)
\ No newline at end of file
+"""
+Excel Pricing & Payoff Model Generator
+Creates professional Excel models for trade analysis
+"""
+
+from copy import copy
+
+import pandas as pd
+import numpy as np
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
+from openpyxl.styles.fonts import DEFAULT_FONT
+from openpyxl.chart import LineChart, Reference, BarChart
+from openpyxl.utils.dataframe import dataframe_to_rows
+
+try:
+    from scripts.payoff_engine import STATUS_LABELS, directional_payoff, option_payoff, spread_payoff
+except ImportError:
+    from payoff_engine import STATUS_LABELS, directional_payoff, option_payoff, spread_payoff
+
+# Scenario grids up to this many rows are written as live formulas; denser
+# grids are written as precomputed values plus a live-formula summary band
+FORMULA_ROWS = 50
+
+def directional_layout(trade_name="Long Copper", entry_price=8650, target_price=9200,
+                       stop_price=8400, notional=1000000, prices=None):
+    """
+    Sheet layout of the directional trade model
+    
+    prices: scenario grid (default: entry -500 to +700 in steps of 100)
+    """
+    if prices is None:
+        prices = np.arange(entry_price - 500, entry_price + 800, 100)
+    
+    def scenario_values():
+        payoff = directional_payoff(prices, entry_price, target_price, stop_price, notional)
+        return [payoff['change'][:, 0], payoff['pnl'][:, 0], payoff['return'][:, 0],
+                STATUS_LABELS[payoff['status'][:, 0]]]
+    
+    return {
+        'sheet': 'Directional Trade',
+        'title': 'DIRECTIONAL TRADE PRICING MODEL',
+        'color': '1e3a8a',
+        'merge': 'A1:F1',
+        'title_alignment': {'horizontal': 'center', 'vertical': 'center'},
+        'params_title': 'TRADE PARAMETERS',
+        'params': [
+            ['Trade Name:', trade_name],
+            ['Entry Price:', entry_price],
+            ['Target Price:', target_price],
+            ['Stop Loss:', stop_price],
+            ['Notional (USD):', notional],
+            ['', ''],
+            ['Risk/Reward:', '=ABS((C6-C5)/(C7-C5))'],
+            ['Max Profit:', '=(C6-C5)/C5'],
+            ['Max Loss:', '=(C7-C5)/C5']
+        ],
+        'percent_from_row': 11,
+        'scenario_title': 'SCENARIO ANALYSIS',
+        'scenario_row': 15,
+        'headers': ['Price', '% Change', 'P&L ($)', 'Return %', 'Status'],
+        'header_color': '2563eb',
+        'header_alignment': {'horizontal': 'center'},
+        'grid': prices,
+        'formulas': ['=(A{r}-$C$5)/$C$5', '=(A{r}-$C$5)*($C$8/$C$5)', '=C{r}/$C$8',
+                     '=IF(A{r}>=$C$6,"TARGET",IF(A{r}<=$C$7,"STOP","ACTIVE"))'],
+        'formats': {'B': '0.00%', 'C': '$#,##0', 'D': '0.00%'},
+        'values': scenario_values,
+        'band': [('Stop', '=$C$7'), ('Entry', '=$C$5'), ('Target', '=$C$6')],
+        'chart': {'title': "P&L Payoff Diagram", 'style': 10, 'x_title': 'Copper Price'},
+        'widths': {'A': 15, 'B': 12, 'C': 15, 'D': 12, 'E': 12},
+    }
+
+
+def spread_layout(metal1="Copper", metal2="Aluminum", entry_ratio=3.76, target_ratio=4.00,
+                  stop_ratio=3.60, notional=500000, ratios=None):
+    """
+    Sheet layout of the spread trade model
+    
+    ratios: scenario grid (default: 3.4 to 4.2 in steps of 0.1)
+    """
+    if ratios is None:
+        ratios = [round(ratio, 2) for ratio in np.arange(3.4, 4.3, 0.1)]
+    
+    def scenario_values():
+        payoff = spread_payoff(ratios, entry_ratio, target_ratio, stop_ratio, notional)
+        return [payoff['change'][:, 0], payoff['pnl'][:, 0], payoff['return'][:, 0]]
+    
+    return {
+        'sheet': 'Spread Trade',
+        'title': 'SPREAD TRADE PRICING MODEL',
+        'color': '10b981',
+        'merge': 'A1:F1',
+        'title_alignment': {'horizontal': 'center', 'vertical': 'center'},
+        'params_title': 'SPREAD PARAMETERS',
+        'params': [
+            ['Long:', metal1],
+            ['Short:', metal2],
+            ['Entry Ratio:', entry_ratio],
+            ['Target Ratio:', target_ratio],
+            ['Stop Ratio:', stop_ratio],
+            ['Notional (USD):', notional],
+            ['', ''],
+            ['Upside:', '=(C7-C6)/C6'],
+            ['Downside:', '=(C8-C6)/C6']
+        ],
+        'percent_from_row': 11,
+        'scenario_title': 'SPREAD SCENARIO ANALYSIS',
+        'scenario_row': 15,
+        'headers': ['Spread Ratio', '% from Entry', 'P&L ($)', 'Return %'],
+        'header_color': '10b981',
+        'header_alignment': {'horizontal': 'center'},
+        'grid': ratios,
+        'formulas': ['=(A{r}-$C$6)/$C$6', '=(A{r}-$C$6)/$C$6*$C$9', '=C{r}/$C$9'],
+        'formats': {'B': '0.00%', 'C': '$#,##0', 'D': '0.00%'},
+        'values': scenario_values,
+        'band': [('Stop', '=$C$8'), ('Entry', '=$C$6'), ('Target', '=$C$7')],
+        'chart': {'title': "Spread P&L Profile", 'style': 12, 'x_title': f'{metal1}/{metal2} Ratio'},
+        'widths': {},
+    }
+
+
+def option_layout(option_type="Call", strike=8800, premium=150, notional=1000000, prices=None):
+    """
+    Sheet layout of the option payoff model
+    
+    prices: spot scenario grid (default: strike -600 to +700 in steps of 100)
+    """
+    if prices is None:
+        prices = np.arange(strike - 600, strike + 800, 100)
+    
+    def scenario_values():
+        payoff = option_payoff(prices, strike, premium, option_type)
+        return [payoff['intrinsic'][:, 0], payoff['pnl'][:, 0], payoff['return'][:, 0]]
+    
+    intrinsic = '=MAX(A{r}-$C$5,0)' if option_type == 'Call' else '=MAX($C$5-A{r},0)'
+    return {
+        'sheet': 'Option Payoff',
+        'title': f'{option_type.upper()} OPTION PAYOFF MODEL',
+        'color': 'eab308',
+        'merge': 'A1:E1',
+        'title_alignment': {'horizontal': 'center'},
+        'params_title': 'OPTION PARAMETERS',
+        'params': [
+            ['Type:', option_type],
+            ['Strike Price:', strike],
+            ['Premium Paid:', premium],
+            ['Notional:', notional],
+            ['Break-even:', f'=$C$5+$C$6' if option_type == 'Call' else f'=$C$5-$C$6']
+        ],
+        'percent_from_row': None,
+        'scenario_title': 'PAYOFF ANALYSIS',
+        'scenario_row': 11,
+        'headers': ['Spot Price', 'Intrinsic Value', 'Net P&L', 'Return %'],
+        'header_color': 'eab308',
+        'header_alignment': None,
+        'grid': prices,
+        'formulas': [intrinsic, '=B{r}-$C$6', '=C{r}/$C$6'],
+        'formats': {'C': '$#,##0', 'D': '0.00%'},
+        'values': scenario_values,
+        'band': [('Strike', '=$C$5'), ('Break-even', '=$C$8')],
+        'chart': None,
+        'widths': {},
+    }
+
+
+LAYOUTS = {'directional': directional_layout, 'spread': spread_layout, 'option': option_layout}
+
+
+def _scenario_rows(layout):
+    """
+    (row number, values) of the scenario table and, for grids longer than
+    FORMULA_ROWS, the live-formula key-level band; values are live formula
+    strings or the payoff engine's precomputed numbers. Band rows end
+    with their label.
+    """
+    first_row = layout['scenario_row'] + 2
+    grid, formulas = layout['grid'], layout['formulas']
+    
+    if len(grid) <= FORMULA_ROWS:
+        for offset, level in enumerate(grid):
+            i = first_row + offset
+            yield i, [level] + [template.format(r=i) for template in formulas]
+        return
+    
+    columns = [np.asarray(grid).tolist()] + [np.asarray(column).tolist()
+                                             for column in layout['values']()]
+    yield from enumerate((list(row) for row in zip(*columns)), start=first_row)
+    
+    band_row = first_row + len(grid) + 1
+    yield band_row, ['KEY SCENARIOS (live formulas)']
+    for i, (label, level) in enumerate(layout['band'], start=band_row + 1):
+        yield i, [level] + [template.format(r=i) for template in formulas] + [label]
+
+
+def _payoff_chart(ws, layout):
+    """Line chart of the P&L column against the scenario grid"""
+    spec = layout['chart']
+    header_row = layout['scenario_row'] + 1
+    chart = LineChart()
+    chart.title = spec['title']
+    chart.style = spec['style']
+    chart.y_axis.title = 'P&L ($)'
+    chart.x_axis.title = spec['x_title']
+    
+    data = Reference(ws, min_col=3, min_row=header_row, max_row=header_row+len(layout['grid']))
+    cats = Reference(ws, min_col=1, min_row=header_row+1, max_row=header_row+len(layout['grid']))
+    chart.add_data(data, titles_from_data=True)
+    chart.set_categories(cats)
+    return chart
+
+class ExcelPricingModel:
+    """
+    Generate Excel pricing models with formulas and charts
+    """
+    
+    def __init__(self):
+        self.wb = Workbook()
+    
+    def _render(self, ws, layout):
+        """
+        Write a model layout into a regular worksheet cell by cell
+        """
+        fill = PatternFill(start_color=layout['color'], end_color=layout['color'], fill_type='solid')
+        header_fill = PatternFill(start_color=layout['header_color'],
+                                  end_color=layout['header_color'], fill_type='solid')
+        
+        # Header
+        ws['A1'] = layout['title']
+        ws['A1'].font = Font(size=16, bold=True, color='FFFFFF')
+        ws['A1'].fill = fill
+        ws.merge_cells(layout['merge'])
+        ws['A1'].alignment = Alignment(**layout['title_alignment'])
+        ws.row_dimensions[1].height = 30
+        
+        # Parameters
+        ws['A3'] = layout['params_title']
+        ws['A3'].font = Font(bold=True, size=12)
+        
+        percent_from_row = layout['percent_from_row']
+        for i, (label, value) in enumerate(layout['params'], start=4):
+            ws[f'A{i}'] = label
+            ws[f'A{i}'].font = Font(bold=True)
+            ws[f'C{i}'] = value
+            if percent_from_row and i >= percent_from_row:
+                ws[f'C{i}'].number_format = '0.00%'
+        
+        # Scenarios
+        scenario_row = layout['scenario_row']
+        ws[f'A{scenario_row}'] = layout['scenario_title']
+        ws[f'A{scenario_row}'].font = Font(bold=True, size=12)
+        
+        for col, header in enumerate(layout['headers'], start=1):
+            cell = ws.cell(row=scenario_row + 1, column=col)
+            cell.value = header
+            cell.font = Font(bold=True, color='FFFFFF')
+            cell.fill = header_fill
+            if layout['header_alignment']:
+                cell.alignment = Alignment(**layout['header_alignment'])
+        
+        formats = layout['formats']
+        for i, values in _scenario_rows(layout):
+            for col, value in enumerate(values, start=1):
+                cell = ws.cell(row=i, column=col)
+                cell.value = value
+                if cell.column_letter in formats and len(values) > 1:
+                    cell.number_format = formats[cell.column_letter]
+            if len(values) == 1:
+                ws[f'A{i}'].font = Font(bold=True)
+        
+        if layout['chart']:
+            ws.add_chart(_payoff_chart(ws, layout), "G3")
+        
+        for column, width in layout['widths'].items():
+            ws.column_dimensions[column].width = width
+    
+    def create_directional_trade_model(self,
+                                      trade_name="Long Copper",
+                                      entry_price=8650,
+                                      target_price=9200,
+                                      stop_price=8400,
+                                      notional=1000000,
+                                      prices=None,
+                                      sheet_title=None):
+        """
+        Create directional trade pricing model
+        
+        prices: scenario grid (default: entry -500 to +700 in steps of 100)
+        sheet_title: add a new sheet with this title instead of using the
+                     workbook's first sheet
+        """
+        layout = directional_layout(trade_name, entry_price, target_price, stop_price,
+                                    notional, prices)
+        if sheet_title is None:
+            ws = self.wb.active
+            ws.title = layout['sheet']
+        else:
+            ws = self.wb.create_sheet(sheet_title)
+        self._render(ws, layout)
+        
+        print("✓ Created directional trade model")
+    
+    def create_spread_trade_model(self,
+                                 metal1="Copper",
+                                 metal2="Aluminum",
+                                 entry_ratio=3.76,
+                                 target_ratio=4.00,
+                                 stop_ratio=3.60,
+                                 notional=500000,
+                                 ratios=None,
+                                 sheet_title=None):
+        """
+        Create spread trade pricing model
+        
+        ratios: scenario grid (default: 3.4 to 4.2 in steps of 0.1)
+        """
+        layout = spread_layout(metal1, metal2, entry_ratio, target_ratio, stop_ratio,
+                               notional, ratios)
+        self._render(self.wb.create_sheet(sheet_title or layout['sheet']), layout)
+        
+        print("✓ Created spread trade model")
+    
+    def create_option_payoff_model(self,
+                                  option_type="Call",
+                                  strike=8800,
+                                  premium=150,
+                                  notional=1000000,
+                                  prices=None,
+                                  sheet_title=None):
+        """
+        Create option payoff model (conceptual)
+        
+        prices: spot scenario grid (default: strike -600 to +700 in steps of 100)
+        """
+        layout = option_layout(option_type, strike, premium, notional, prices)
+        self._render(self.wb.create_sheet(sheet_title or layout['sheet']), layout)
+        
+        print(f"✓ Created {option_type} option model")
+    
+    def save(self, filename='metals_pricing_models.xlsx'):
+        """
+        Save Excel workbook
+        """
+        self.wb.save(filename)
+        print(f"\n✓ Saved Excel pricing models: {filename}")
+
+
+class BulkPricingWriter:
+    """
+    Stream many trade models into one workbook
+    
+    Uses openpyxl write-only worksheets: each sheet's rows are serialized
+    as they are appended instead of being held as cell objects, and every
+    font/fill/number format is a named style registered once per workbook
+    rather than new style objects per cell. Sheets have the same layout
+    and charts as ExcelPricingModel's.
+    """
+    
+    def __init__(self):
+        self.wb = Workbook(write_only=True)
+        self.styles = {}
+        self.sheets = 0
+    
+    def _style(self, name, **attributes):
+        """Register a named style on first use and return its name"""
+        if name not in self.styles:
+            self.wb.add_named_style(NamedStyle(name=name, **attributes))
+            self.styles[name] = None
+        return name
+    
+    def _cell(self, ws, value, style):
+        """
+        Styled write-only cell; the named style is resolved once and its
+        style indices copied onto later cells
+        """
+        cell = WriteOnlyCell(ws, value=value)
+        if self.styles[style] is None:
+            cell.style = style
+            self.styles[style] = cell._style
+        else:
+            cell._style = copy(self.styles[style])
+        return cell
+    
+    def add_model(self, model='directional', sheet_title=None, **kwargs):
+        """
+        Append one model sheet; kwargs are the matching ExcelPricingModel
+        create_* arguments. Returns the sheet title.
+        """
+        layout = LAYOUTS[model](**kwargs)
+        ws = self.wb.create_sheet(sheet_title or layout['sheet'])
+        self.sheets += 1
+        
+        # Row and column dimensions must be set before any row is written
+        ws.row_dimensions[1].height = 30
+        for column, width in layout['widths'].items():
+            ws.column_dimensions[column].width = width
+        ws.merged_cells.add(layout['merge'])
+        
+        color, header_color = layout['color'], layout['header_color']
+        title = self._style(
+            f"model_title_{color}_{'_'.join(layout['title_alignment'].values())}",
+            font=Font(size=16, bold=True, color='FFFFFF'),
+            fill=PatternFill(start_color=color, end_color=color, fill_type='solid'),
+            alignment=Alignment(**layout['title_alignment'])
+        )
+        header = self._style(
+            f"model_header_{header_color}_{'_'.join((layout['header_alignment'] or {}).values())}",
+            font=Font(bold=True, color='FFFFFF'),
+            fill=PatternFill(start_color=header_color, end_color=header_color, fill_type='solid'),
+            alignment=Alignment(**(layout['header_alignment'] or {}))
+        )
+        section = self._style('model_section', font=Font(bold=True, size=12))
+        label = self._style('model_label', font=Font(bold=True))
+        formats = {column: self._style(f'model_format_{number_format}', font=DEFAULT_FONT,
+                                       number_format=number_format)
+                   for column, number_format in layout['formats'].items()}
+        percent = self._style('model_format_0.00%', font=DEFAULT_FONT, number_format='0.00%')
+        
+        ws.append([self._cell(ws, layout['title'], title)])
+        ws.append([])
+        ws.append([self._cell(ws, layout['params_title'], section)])
+        
+        percent_from_row = layout['percent_from_row']
+        for i, (name, value) in enumerate(layout['params'], start=4):
+            if percent_from_row and i >= percent_from_row:
+                value = self._cell(ws, value, percent)
+            ws.append([self._cell(ws, name, label), None, value])
+        
+        for _ in range(4 + len(layout['params']), layout['scenario_row']):
+            ws.append([])
+        ws.append([self._cell(ws, layout['scenario_title'], section)])
+        ws.append([self._cell(ws, text, header) for text in layout['headers']])
+        
+        # Scenario rows in one pass; only formatted columns become cells
+        styled = [(index, formats[column]) for index, column in enumerate('ABCDEFGH')
+                  if column in formats]
+        next_row = layout['scenario_row'] + 2
+        for i, values in _scenario_rows(layout):
+            for _ in range(next_row, i):
+                ws.append([])
+            next_row = i + 1
+            if len(values) == 1:
+                ws.append([self._cell(ws, values[0], label)])
+                continue
+            for index, style in styled:
+                values[index] = self._cell(ws, values[index], style)
+            ws.append(values)
+        
+        if layout['chart']:
+            ws.add_chart(_payoff_chart(ws, layout), "G3")
+        
+        return ws.title
+    
+    def add_models(self, trades):
+        """
+        Append one sheet per trade: dicts with 'model' ('directional',
+        'spread' or 'option'), optional 'sheet_title' and create_* arguments
+        """
+        return [self.add_model(**trade) for trade in trades]
+    
+    def save(self, filename='metals_pricing_models_bulk.xlsx'):
+        """
+        Save the workbook (a write-only workbook can only be saved once)
+        """
+        self.wb.save(filename)
+        print(f"\n✓ Saved {self.sheets} Excel pricing models: {filename}")
+
+
+# Example usage
+def main():
+    """
+    Build the directional, spread and option pricing workbook
+    """
+    excel = ExcelPricingModel()
+    
+    # Create all models
+    excel.create_directional_trade_model(
+        trade_name="Long Copper",
+        entry_price=8650,
+        target_price=9200,
+        stop_price=8400,
+        notional=1000000
+    )
+    
+    excel.create_spread_trade_model(
+        metal1="Copper",
+        metal2="Aluminum",
+        entry_ratio=3.76,
+        target_ratio=4.00,
+        stop_ratio=3.60,
+        notional=500000
+    )
+    
+    excel.create_option_payoff_model(
+        option_type="Call",
+        strike=8800,
+        premium=150,
+        notional=1000000
+    )
+    
+    excel.save()
+    
+    print("\n" + "="*60)
+    print("Excel models created with:")
+    print("  • Dynamic formulas for P&L calculation")
+    print("  • Scenario analysis tables")
+    print("  • Professional charts")
+    print("  • Risk metrics")
+    print("="*60)
+    
+    return excel
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Master Dataset Storage
+Typed columnar (Parquet) store shared by the analytics modules
+"""
+
+import pandas as pd
+
+MASTER_DATASET = 'metals_master_data.parquet'
+MASTER_DATASET_CSV = 'metals_master_data.csv'
+
+# Metal price columns of the master dataset
+METALS = ['copper', 'aluminum', 'zinc', 'gold', 'silver']
+
+
+def save_master_dataset(df, filename=MASTER_DATASET):
+    """
+    Write the master dataset as Parquet with a typed date column
+    """
+    df = df.copy()
+    df['date'] = pd.to_datetime(df['date'])
+    df.to_parquet(filename, index=False)
+
+
+def export_master_dataset_csv(df, filename=MASTER_DATASET_CSV):
+    """
+    Export the master dataset as CSV for spreadsheets and external tools
+    """
+    df.to_csv(filename, index=False)
+
+
+def load_master_dataset(data_file=MASTER_DATASET, columns=None, start_date=None, end_date=None):
+    """
+    Load the master dataset
+
+    columns: only read these columns ('date' is always included)
+    start_date / end_date: keep rows with start_date <= date <= end_date
+
+    Parquet files are read with column projection and row-group filters
+    pushed down to the reader; CSV files are still accepted and parsed.
+    """
+    if columns is not None:
+        columns = ['date'] + [col for col in columns if col != 'date']
+
+    if str(data_file).endswith('.csv'):
+        df = pd.read_csv(data_file, usecols=columns)
+        df['date'] = pd.to_datetime(df['date'])
+        if start_date is not None:
+            df = df[df['date'] >= pd.Timestamp(start_date)]
+        if end_date is not None:
+            df = df[df['date'] <= pd.Timestamp(end_date)]
+        return df.reset_index(drop=True)
+
+    filters = []
+    if start_date is not None:
+        filters.append(('date', '>=', pd.Timestamp(start_date)))
+    if end_date is not None:
+        filters.append(('date', '<=', pd.Timestamp(end_date)))
+
+    return pd.read_parquet(data_file, columns=columns, filters=filters or None)
+
+
+def master_dataset_columns(data_file=MASTER_DATASET):
+    """
+    Column names of the master dataset, read from the file schema/header only
+    """
+    if str(data_file).endswith('.csv'):
+        return pd.read_csv(data_file, nrows=0).columns.tolist()
+    
+    import pyarrow.parquet as pq
+    return pq.read_schema(data_file).names
@@ -0,0 +1,200 @@
+"""
+Cross-Metal Pairs Scanner
+Ranks every pair in the price panel by z-score, half-life and cointegration
+"""
+
+import numpy as np
+import pandas as pd
+
+try:
+    from scripts.master_dataset import METALS, load_master_dataset
+except ImportError:
+    from master_dataset import METALS, load_master_dataset
+
+FX_COLUMNS = ('usdcnh', 'usdinr')
+
+# Engle-Granger critical values for the two-variable residual ADF test
+# (constant, no trend; MacKinnon 2010 asymptotic values)
+EG_CRITICAL_VALUES = {0.01: -3.90, 0.05: -3.34, 0.10: -3.04}
+
+
+def price_panel(df, instruments=METALS, fx_columns=None):
+    """
+    (n_days, k) log-price matrix for the scanner plus the series labels
+    and the underlying instrument of each series
+    
+    fx_columns: also add each instrument converted into local currency
+                (e.g. copper_usdcnh = copper * usdcnh); rows with a
+                missing value in any series are dropped
+    """
+    columns = {name: df[name].to_numpy(dtype=np.float64) for name in instruments}
+    bases = list(instruments)
+    for fx in fx_columns or ():
+        rate = df[fx].to_numpy(dtype=np.float64)
+        for name in instruments:
+            columns[f'{name}_{fx}'] = columns[name] * rate
+            bases.append(name)
+    
+    panel = np.column_stack(list(columns.values()))
+    keep = ~np.isnan(panel).any(axis=1)
+    dates = df['date'].to_numpy()[keep] if 'date' in df else None
+    return np.log(panel[keep]), list(columns), bases, dates
+
+
+def _pair_quadratic(gram, i, j, beta):
+    """
+    sum((a_i - beta * a_j) * (b_i - beta * b_j)) for every pair from the
+    Gram matrix a.T @ b
+    """
+    return gram[i, i] - beta * (gram[i, j] + gram[j, i]) + beta ** 2 * gram[j, j]
+
+
+def pair_statistics(log_prices, window=60):
+    """
+    Hedge ratio, return correlation, latest z-score, half-life and
+    Engle-Granger ADF statistic for all k*(k-1)/2 pairs at once
+    
+    The spread of pair (i, j) is log p_i - beta * log p_j with the OLS
+    hedge ratio beta. Every per-pair sum the statistics need is a
+    quadratic form in a handful of k x k Gram matrices of the price panel,
+    so the cost is a few matrix products rather than one regression per
+    pair. Returns a dict of arrays indexed like np.triu_indices(k, 1).
+    """
+    n, k = log_prices.shape
+    i, j = np.triu_indices(k, 1)
+    
+    centered = log_prices - log_prices.mean(axis=0)
+    levels = centered.T @ centered
+    with np.errstate(divide='ignore', invalid='ignore'):
+        beta = levels[i, j] / levels[j, j]
+        
+        # Residual ADF regression: diff(e) = gamma * e[t-1] + noise
+        lagged, changes = centered[:-1], np.diff(centered, axis=0)
+        lag_gram = _pair_quadratic(lagged.T @ lagged, i, j, beta)
+        cross_gram = _pair_quadratic(changes.T @ lagged, i, j, beta)
+        change_gram = _pair_quadratic(changes.T @ changes, i, j, beta)
+        gamma = cross_gram / lag_gram
+        residual_var = np.maximum(change_gram - gamma * cross_gram, 0.0) / (n - 2)
+        adf_stat = gamma / np.sqrt(residual_var / lag_gram)
+        half_life = np.where(gamma < 0, -np.log(2) / np.log1p(np.maximum(gamma, -1 + 1e-12)),
+                             np.inf)
+        
+        # Daily log-return correlation of the two legs
+        return_gram = changes.T @ changes
+        correlation = return_gram[i, j] / np.sqrt(return_gram[i, i] * return_gram[j, j])
+        
+        # Latest spread against its trailing window
+        recent = log_prices[-window:]
+        recent_mean = recent.mean(axis=0)
+        recent_centered = recent - recent_mean
+        spread_std = np.sqrt(_pair_quadratic(recent_centered.T @ recent_centered, i, j, beta)
+                             / (len(recent) - 1))
+        spread_now = log_prices[-1, i] - beta * log_prices[-1, j]
+        zscore = (spread_now - (recent_mean[i] - beta * recent_mean[j])) / spread_std
+    
+    return {
+        'leg1': i,
+        'leg2': j,
+        'hedge_ratio': beta,
+        'correlation': correlation,
+        'zscore': zscore,
+        'half_life': half_life,
+        'adf_stat': adf_stat,
+    }
+
+
+def rolling_pair_zscores(log_prices, leg1, leg2, hedge_ratio, window=60):
+    """
+    (n_days, n_pairs) rolling z-scores of the hedged log spreads
+    
+    Rolling means and variances come from cumulative sums over the whole
+    spread matrix; the first window - 1 rows are NaN.
+    """
+    spreads = log_prices[:, leg1] - hedge_ratio * log_prices[:, leg2]
+    spreads -= spreads[0]
+    
+    zeros = np.zeros((1, spreads.shape[1]))
+    sums = np.concatenate([zeros, np.cumsum(spreads, axis=0)])
+    squares = np.concatenate([zeros, np.cumsum(spreads ** 2, axis=0)])
+    mean = (sums[window:] - sums[:-window]) / window
+    var = (squares[window:] - squares[:-window] - window * mean ** 2) / (window - 1)
+    
+    zscores = np.full(spreads.shape, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        zscores[window - 1:] = (spreads[window - 1:] - mean) / np.sqrt(np.maximum(var, 0.0))
+    return zscores
+
+
+def scan_pairs(df, instruments=METALS, fx_adjusted=False, window=60, lookback=None,
+               entry_z=2.0, significance=0.05, max_half_life=None, cross_currency=False):
+    """
+    Rank every instrument pair as a mean-reversion opportunity
+    
+    instruments: price columns to pair up (any universe size)
+    fx_adjusted: also pair the instruments in local currency via the
+                 usdcnh/usdinr columns (a series is never paired with the
+                 same instrument in another currency)
+    cross_currency: with fx_adjusted, also pair series quoted in different
+                    currencies (e.g. copper_usdcnh vs aluminum_usdinr);
+                    by default only same-currency pairs are scanned
+    window: trailing bars for the current spread z-score
+    lookback: bars used for hedge ratios and cointegration (None = all)
+    entry_z: |z| above which the pair gets a long/short spread signal
+    significance: cointegration test level, one of EG_CRITICAL_VALUES
+    max_half_life: drop pairs that revert slower than this many bars
+    
+    Pairs are ranked cointegrated-first, then by |z|. Returns a DataFrame
+    with one row per pair.
+    """
+    if significance not in EG_CRITICAL_VALUES:
+        raise ValueError(f"significance must be one of {sorted(EG_CRITICAL_VALUES)}, "
+                         f"not {significance!r}")
+    
+    fx_columns = [fx for fx in FX_COLUMNS if fx in df] if fx_adjusted else []
+    log_prices, labels, bases, _ = price_panel(df, instruments, fx_columns)
+    currencies = np.array(['usd'] * len(instruments) + [fx for fx in fx_columns for _ in instruments])
+    if lookback is not None:
+        log_prices = log_prices[-lookback:]
+    if len(log_prices) < max(window, 3):
+        raise ValueError(f"Need at least {max(window, 3)} complete rows to scan pairs")
+    
+    stats = pair_statistics(log_prices, window)
+    leg1, leg2 = stats.pop('leg1'), stats.pop('leg2')
+    labels, bases = np.array(labels), np.array(bases)
+    
+    pairs = pd.DataFrame({'leg1': labels[leg1], 'leg2': labels[leg2], **stats})
+    pairs['cointegrated'] = pairs['adf_stat'] < EG_CRITICAL_VALUES[significance]
+    pairs['signal'] = np.select([pairs['zscore'] <= -entry_z, pairs['zscore'] >= entry_z],
+                                ['long spread', 'short spread'], '')
+    pairs['abs_z'] = pairs['zscore'].abs()
+    
+    keep = bases[leg1] != bases[leg2]
+    if not cross_currency:
+        keep &= currencies[leg1] == currencies[leg2]
+    if max_half_life is not None:
+        keep &= pairs['half_life'].to_numpy() <= max_half_life
+    
+    ranked = pairs[keep].sort_values(['cointegrated', 'abs_z'], ascending=False, kind='stable')
+    ranked = ranked.drop(columns='abs_z').reset_index(drop=True)
+    ranked.index = pd.RangeIndex(1, len(ranked) + 1, name='rank')
+    return ranked
+
+
+# Example usage
+def main(df=None):
+    """
+    Print the ranked metal pairs (USD and FX-adjusted) for the master dataset
+    """
+    df = df if df is not None else load_master_dataset()
+    ranked = scan_pairs(df, fx_adjusted=True, lookback=504)
+    
+    print("\n" + "="*70)
+    print(f"PAIRS SCANNER ({len(ranked)} pairs, 2-year cointegration window)")
+    print("="*70)
+    print(ranked.head(15).round(3).to_string())
+    
+    return ranked
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Scenario & Payoff Engine
+Vectorized P&L for price scenarios across directional, spread and option trades
+"""
+
+import numpy as np
+import pandas as pd
+
+# Status codes returned by the payoff functions
+ACTIVE, TARGET, STOP = 0, 1, 2
+STATUS_LABELS = np.array(['ACTIVE', 'TARGET', 'STOP'])
+
+
+def _column(values):
+    """Per-trade parameters as a (1, n_trades) row for broadcasting"""
+    return np.atleast_1d(np.asarray(values, dtype=np.float64))[None, :]
+
+
+def _scenarios(prices, n_trades):
+    """(n_scenarios, n_trades) grid from a shared 1-D grid or a 2-D one"""
+    prices = np.asarray(prices, dtype=np.float64)
+    if prices.ndim == 1:
+        prices = prices[:, None]
+    return np.broadcast_to(prices, (len(prices), max(n_trades, prices.shape[1])))
+
+
+def directional_payoff(prices, entry, target=np.nan, stop=np.nan, notional=1.0, direction=1):
+    """
+    P&L of outright positions over price scenarios
+    
+    prices: 1-D grid shared by every trade, or (n_scenarios, n_trades)
+    entry, target, stop, notional, direction (+1 long / -1 short):
+        scalars or one value per trade
+    
+    Returns a dict of (n_scenarios, n_trades) arrays: 'change' (fraction
+    from entry), 'pnl' (USD), 'return' (fraction of notional) and
+    'status' (ACTIVE/TARGET/STOP codes; labels via STATUS_LABELS).
+    """
+    entry, target, stop = _column(entry), _column(target), _column(stop)
+    notional, direction = _column(notional), _column(direction)
+    n_trades = max(entry.shape[1], target.shape[1], stop.shape[1],
+                   notional.shape[1], direction.shape[1])
+    prices = _scenarios(prices, n_trades)
+    
+    change = (prices - entry) / entry
+    signed = direction * change
+    
+    # Targets sit above entry for longs and below it for shorts
+    favourable = direction * (prices - target) >= 0
+    adverse = direction * (prices - stop) <= 0
+    status = np.where(favourable, TARGET, np.where(adverse, STOP, ACTIVE)).astype(np.int8)
+    
+    return {
+        'change': change,
+        'pnl': signed * notional,
+        'return': signed,
+        'status': status,
+    }
+
+
+def spread_payoff(ratios, entry_ratio, target_ratio=np.nan, stop_ratio=np.nan, notional=1.0,
+                  direction=1):
+    """
+    P&L of ratio spreads (long metal1 / short metal2 for direction=+1)
+    over ratio scenarios; same outputs as directional_payoff
+    """
+    return directional_payoff(ratios, entry_ratio, target_ratio, stop_ratio, notional,
+                              direction)
+
+
+def option_payoff(spots, strike, premium, option_type='Call', quantity=1.0):
+    """
+    Expiry payoff of long calls/puts over spot scenarios
+    
+    option_type: 'Call'/'Put', or one per trade
+    quantity: units per trade (1.0 gives per-unit P&L)
+    
+    Returns a dict of (n_scenarios, n_trades) arrays: 'intrinsic' (per
+    unit), 'pnl' (intrinsic - premium, times quantity) and 'return'
+    (fraction of premium paid).
+    """
+    strike, premium, quantity = _column(strike), _column(premium), _column(quantity)
+    is_call = np.atleast_1d(np.char.lower(np.asarray(option_type, dtype=str)) == 'call')[None, :]
+    n_trades = max(strike.shape[1], premium.shape[1], quantity.shape[1], is_call.shape[1])
+    spots = _scenarios(spots, n_trades)
+    
+    intrinsic = np.maximum(np.where(is_call, spots - strike, strike - spots), 0.0)
+    net = intrinsic - premium
+    return {
+        'intrinsic': intrinsic,
+        'pnl': net * quantity,
+        'return': net / premium,
+    }
+
+
+def evaluate_book(trades, moves):
+    """
+    P&L of a book of trades under shared relative price moves
+    
+    trades: DataFrame (or list of dicts) with 'type' ('directional',
+            'spread', 'call' or 'put') and per type:
+              directional/spread: entry, target, stop, notional, direction
+              call/put: strike, premium, quantity
+    moves: 1-D fractional moves applied to every trade's reference level
+           (entry, or strike for options), e.g. np.linspace(-0.2, 0.2, 4001)
+    
+    Each trade type is valued in one broadcast call. Returns a dict of
+    (n_moves, n_trades) arrays 'price', 'pnl', 'return' and 'status' in
+    the book's row order, plus 'book_pnl' (total P&L per move).
+    """
+    trades = pd.DataFrame(trades).reset_index(drop=True)
+    moves = np.asarray(moves, dtype=np.float64)[:, None]
+    shape = (len(moves), len(trades))
+    
+    # Column-major (each trade's scenarios contiguous), so writing one
+    # trade type's results back into book order copies whole rows
+    result = {
+        'price': np.empty(shape, order='F'),
+        'pnl': np.empty(shape, order='F'),
+        'return': np.empty(shape, order='F'),
+        'status': np.zeros(shape, dtype=np.int8, order='F'),
+    }
+    
+    def defaults(rows, column, value):
+        return rows[column].fillna(value).to_numpy() if column in rows else value
+    
+    kinds = trades['type'].str.lower()
+    unknown = ~kinds.isin(['directional', 'spread', 'call', 'put'])
+    if unknown.any():
+        raise ValueError(f"Unknown trade types: {sorted(set(trades['type'][unknown]))}")
+    
+    linear = trades[kinds.isin(['directional', 'spread'])]
+    if len(linear):
+        entry = linear['entry'].to_numpy(dtype=np.float64)
+        prices = (entry[:, None] * (1.0 + moves.T)).T
+        payoff = directional_payoff(prices, entry, defaults(linear, 'target', np.nan),
+                                    defaults(linear, 'stop', np.nan),
+                                    defaults(linear, 'notional', 1.0),
+                                    defaults(linear, 'direction', 1))
+        columns = linear.index.to_numpy()
+        result['price'][:, columns] = prices
+        for name in ('pnl', 'return', 'status'):
+            result[name][:, columns] = payoff[name]
+    
+    options = trades[kinds.isin(['call', 'put'])]
+    if len(options):
+        strike = options['strike'].to_numpy(dtype=np.float64)
+        spots = (strike[:, None] * (1.0 + moves.T)).T
+        payoff = option_payoff(spots, strike, options['premium'].to_numpy(dtype=np.float64),
+                               kinds[options.index].to_numpy(), defaults(options, 'quantity', 1.0))
+        columns = options.index.to_numpy()
+        result['price'][:, columns] = spots
+        result['pnl'][:, columns] = payoff['pnl']
+        result['return'][:, columns] = payoff['return']
+    
+    result['book_pnl'] = result['pnl'].sum(axis=1)
+    return result
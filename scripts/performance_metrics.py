@@ -0,0 +1,133 @@
+"""
+Time-Based Performance Metrics
+Vectorized metrics on daily equity curves (one curve or thousands at once)
+"""
+
+import numpy as np
+import pandas as pd
+
+PERIODS_PER_YEAR = 252
+
+
+def _as_2d(values):
+    """(n_days, n_curves) float array and column labels for 1-D/2-D input"""
+    labels = values.columns if isinstance(values, pd.DataFrame) else None
+    array = np.asarray(values, dtype=np.float64)
+    if array.ndim == 1:
+        array = array[:, None]
+    return array, labels
+
+
+def _package(metrics, labels, single):
+    """dict of floats for one curve, DataFrame (one row per curve) otherwise"""
+    if single:
+        return {name: float(values[0]) for name, values in metrics.items()}
+    return pd.DataFrame(metrics, index=labels)
+
+
+def returns_to_equity(returns, start=1.0):
+    """Compound per-period returns into equity curves along axis 0"""
+    array = np.asarray(returns, dtype=np.float64)
+    return start * np.cumprod(1.0 + array, axis=0)
+
+
+def equity_to_returns(equity):
+    """Per-period simple returns of equity curves (first period dropped)"""
+    array = np.asarray(equity, dtype=np.float64)
+    previous = array[:-1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(previous > 0, np.diff(array, axis=0) / previous, np.nan)
+
+
+def drawdowns(equity, running_max=None):
+    """Drawdown from the running peak (fractions <= 0), same shape as equity"""
+    array = np.asarray(equity, dtype=np.float64)
+    if running_max is None:
+        running_max = np.maximum.accumulate(array, axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(running_max > 0, array / running_max - 1.0, np.nan)
+
+
+def max_drawdown(equity, running_max=None):
+    """Deepest drawdown of each curve (fraction <= 0)"""
+    return np.nanmin(drawdowns(equity, running_max), axis=0)
+
+
+def max_drawdown_duration(equity, running_max=None):
+    """Longest stretch of periods spent below a previous peak, per curve"""
+    array = np.asarray(equity, dtype=np.float64)
+    if running_max is None:
+        running_max = np.maximum.accumulate(array, axis=0)
+    index = np.arange(len(array)).reshape((-1,) + (1,) * (array.ndim - 1))
+    last_peak = np.maximum.accumulate(np.where(array >= running_max, index, 0), axis=0)
+    return (index - last_peak).max(axis=0)
+
+
+def _moments(returns):
+    """Mean, sample std and downside deviation per column, skipping NaNs"""
+    if not np.isnan(returns).any():
+        downside = np.sqrt(np.mean(np.minimum(returns, 0.0) ** 2, axis=0))
+        return returns.mean(axis=0), returns.std(axis=0, ddof=1), downside
+    
+    downside = np.sqrt(np.nanmean(np.minimum(returns, 0.0) ** 2, axis=0))
+    return np.nanmean(returns, axis=0), np.nanstd(returns, axis=0, ddof=1), downside
+
+
+def equity_metrics(equity, exposure=None, turnover=None, periods_per_year=PERIODS_PER_YEAR):
+    """
+    Performance metrics from daily equity curves
+    
+    equity: 1-D curve or 2-D (n_days, n_curves) array / DataFrame
+    exposure: optional gross exposure per day (fraction of capital), same shape
+    turnover: optional capital traded per day (fraction of capital), same shape
+    
+    Returns a dict for a single curve, or a DataFrame with one row per
+    curve. Sharpe, Sortino, volatility and CAGR are annualized with
+    periods_per_year; drawdown duration is in periods.
+    """
+    curves, labels = _as_2d(equity)
+    single = np.ndim(equity) == 1
+    n_periods = len(curves) - 1
+    
+    mean, std, downside = _moments(equity_to_returns(curves))
+    running_max = np.maximum.accumulate(curves, axis=0)
+    scale = np.sqrt(periods_per_year)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth = curves[-1] / curves[0]
+        cagr = np.where(growth > 0, growth ** (periods_per_year / max(n_periods, 1)) - 1.0, -1.0)
+        sharpe = np.where(std > 0, mean / std * scale, 0.0)
+        sortino = np.where(downside > 0, mean / downside * scale, np.inf)
+        mdd = max_drawdown(curves, running_max)
+        calmar = np.where(mdd < 0, cagr / -mdd, np.inf)
+    
+    metrics = {
+        'total_return': growth - 1.0,
+        'cagr': cagr,
+        'volatility': std * scale,
+        'sharpe_ratio': sharpe,
+        'sortino_ratio': sortino,
+        'max_drawdown': mdd,
+        'max_drawdown_duration': max_drawdown_duration(curves, running_max),
+        'calmar_ratio': calmar,
+    }
+    
+    if exposure is not None:
+        exposure, _ = _as_2d(exposure)
+        metrics['avg_exposure'] = exposure.mean(axis=0)
+        metrics['time_in_market'] = (exposure > 0).mean(axis=0)
+    if turnover is not None:
+        turnover, _ = _as_2d(turnover)
+        metrics['annual_turnover'] = turnover.mean(axis=0) * periods_per_year
+    
+    return _package(metrics, labels, single)
+
+
+def returns_metrics(returns, periods_per_year=PERIODS_PER_YEAR):
+    """equity_metrics for per-period returns (compounded from 1.0)"""
+    array = np.asarray(returns, dtype=np.float64)
+    start = np.ones((1,) + array.shape[1:])
+    equity = np.concatenate([start, returns_to_equity(array)])
+    if isinstance(returns, pd.DataFrame):
+        equity = pd.DataFrame(equity, columns=returns.columns)
+    return equity_metrics(equity, periods_per_year=periods_per_year)
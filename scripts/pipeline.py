@@ -0,0 +1,164 @@
+"""
+In-Process Pipeline Runner
+Runs platform stages as a dependency graph, concurrently where possible
+"""
+
+import importlib
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+def import_script(name):
+    """
+    Import a platform module by name, whether run from the repo root
+    (scripts.<name>) or from inside scripts/ (<name>)
+    """
+    try:
+        return importlib.import_module(f'scripts.{name}')
+    except ImportError:
+        return importlib.import_module(name)
+
+
+class _StageOutput:
+    """
+    sys.stdout stand-in that buffers each stage's prints separately, so
+    concurrent stages don't interleave their output
+    """
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+    
+    def write(self, text):
+        buffer = getattr(self.local, 'buffer', None)
+        if buffer is None:
+            return self.stream.write(text)
+        buffer.append(text)
+        return len(text)
+    
+    def flush(self):
+        self.stream.flush()
+
+
+class Pipeline:
+    """
+    DAG of named stages run in one interpreter
+    
+    Each stage is called with the results of its dependencies (in the order
+    they were declared), so data such as the master dataset is handed
+    between stages in memory. A stage starts as soon as all of its
+    dependencies have finished; independent stages run concurrently on a
+    thread pool. A failed stage skips everything downstream of it.
+    """
+    
+    def __init__(self, max_workers=4):
+        self.max_workers = max_workers
+        self.stages = {}
+        self.results = {}
+        self.timings = {}
+        self.status = {}
+        self.output = {}
+        self.wall_time = 0.0
+    
+    def add_stage(self, name, func, depends_on=()):
+        """Declare a stage; dependencies must already be declared"""
+        if name in self.stages:
+            raise ValueError(f"Duplicate stage: {name}")
+        for dependency in depends_on:
+            if dependency not in self.stages:
+                raise ValueError(f"Stage {name} depends on unknown stage {dependency}")
+        self.stages[name] = (func, tuple(depends_on))
+        return self
+    
+    def _run_stage(self, name, output):
+        func, depends_on = self.stages[name]
+        output.local.buffer = []
+        start = time.perf_counter()
+        try:
+            return func(*[self.results[dependency] for dependency in depends_on])
+        finally:
+            self.timings[name] = (start, time.perf_counter())
+            self.output[name] = ''.join(output.local.buffer)
+            output.local.buffer = None
+    
+    def run(self):
+        """Run every stage; returns {stage: result} for the stages that succeeded"""
+        self.results, self.timings, self.status, self.output = {}, {}, {}, {}
+        pending = dict(self.stages)
+        running = {}
+        output = _StageOutput(sys.stdout)
+        run_start = time.perf_counter()
+        
+        sys.stdout = output
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                while pending or running:
+                    for name, (func, depends_on) in list(pending.items()):
+                        if any(self.status.get(dep) in ('failed', 'skipped') for dep in depends_on):
+                            del pending[name]
+                            self.status[name] = 'skipped'
+                            output.stream.write(f"\n✗ {name} skipped (upstream failure)\n")
+                        elif all(self.status.get(dep) == 'done' for dep in depends_on):
+                            del pending[name]
+                            output.stream.write(f"\n▶ Running {name}...\n")
+                            running[pool.submit(self._run_stage, name, output)] = name
+                    
+                    if not running:
+                        continue
+                    
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        name = running.pop(future)
+                        start, end = self.timings[name]
+                        output.stream.write(self.output[name])
+                        try:
+                            self.results[name] = future.result()
+                            self.status[name] = 'done'
+                            output.stream.write(f"✓ {name} completed in {end - start:.2f}s\n")
+                        except Exception as e:
+                            self.status[name] = 'failed'
+                            output.stream.write(f"✗ {name} failed after {end - start:.2f}s: {e}\n")
+        finally:
+            sys.stdout = output.stream
+        
+        self.wall_time = time.perf_counter() - run_start
+        return self.results
+    
+    def print_timings(self):
+        """Per-stage wall time and start offset relative to the run"""
+        if not self.timings:
+            return
+        
+        origin = min(start for start, _ in self.timings.values())
+        print(f"\n{'Stage':<24} {'Status':<8} {'Start':>8} {'Wall':>8}")
+        print("-"*52)
+        for name in self.stages:
+            if name in self.timings:
+                start, end = self.timings[name]
+                print(f"{name:<24} {self.status[name]:<8} {start - origin:7.2f}s {end - start:7.2f}s")
+            else:
+                print(f"{name:<24} {self.status.get(name, '-'):<8}")
+        
+        stage_total = sum(end - start for start, end in self.timings.values())
+        print("-"*52)
+        print(f"Pipeline wall time: {self.wall_time:.2f}s (stages sum to {stage_total:.2f}s)")
+
+
+def build_platform_pipeline(provider=None, max_workers=4):
+    """
+    The platform workflow: data_processor feeds the commentary and backtest
+    stages; the Excel and trade management stages are independent.
+    Modules are imported when their stage starts.
+    """
+    def stage(module, **kwargs):
+        return lambda *upstream: import_script(module).main(*upstream, **kwargs)
+    
+    pipeline = Pipeline(max_workers=max_workers)
+    pipeline.add_stage('data_processor', stage('data_processor', provider=provider))
+    pipeline.add_stage('market_commentary', stage('market_commentary'), depends_on=['data_processor'])
+    pipeline.add_stage('trade_backtester', stage('trade_backtester'), depends_on=['data_processor'])
+    pipeline.add_stage('excel_pricing_model', stage('excel_pricing_model'))
+    pipeline.add_stage('trade_management', stage('trade_management'))
+    return pipeline
@@ -1,231 +1,735 @@
-"""
-Trade Idea Backtesting & Performance Analysis
-Professional-grade backtesting for metals trading strategies
-"""
-
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-from datetime import datetime, timedelta
-
-class TradeBacktester:
-    """
-    Backtest trading strategies and generate performance metrics
-    """
-    
-    def __init__(self, data_file='metals_master_data.csv'):
-        self.df = pd.read_csv(data_file)
-        self.df['date'] = pd.to_datetime(self.df['date'])
-        self.trades = []
-        
-    def momentum_strategy(self, metal='copper', lookback=20, holding=60):
-        """
-        Simple momentum strategy: Buy when price > MA, sell when < MA
-        """
-        df = self.df.copy()
-        df[f'{metal}_ma'] = df[metal].rolling(lookback).mean()
-        
-        trades = []
-        position = None
-        
-        for i in range(lookback, len(df) - holding):
-            current_price = df.iloc[i][metal]
-            ma_price = df.iloc[i][f'{metal}_ma']
-            
-            # Entry signal
-            if position is None and current_price > ma_price:
-                entry_date = df.iloc[i]['date']
-                entry_price = current_price
-                
-                # Exit after holding period
-                exit_idx = min(i + holding, len(df) - 1)
-                exit_date = df.iloc[exit_idx]['date']
-                exit_price = df.iloc[exit_idx][metal]
-                
-                pnl = (exit_price - entry_price) / entry_price * 100
-                
-                trades.append({
-                    'entry_date': entry_date,
-                    'entry_price': entry_price,
-                    'exit_date': exit_date,
-                    'exit_price': exit_price,
-                    'return': pnl,
-                    'holding_days': (exit_date - entry_date).days
-                })
-                
-                position = None  # Reset after exit
-        
-        return pd.DataFrame(trades)
-    
-    def spread_strategy(self, metal1='copper', metal2='aluminum', 
-                       threshold=0.1, holding=40):
-        """
-        Mean reversion spread strategy
-        """
-        df = self.df.copy()
-        df['spread'] = df[metal1] / df[metal2]
-        df['spread_ma'] = df['spread'].rolling(60).mean()
-        df['spread_std'] = df['spread'].rolling(60).std()
-        
-        trades = []
-        
-        for i in range(60, len(df) - holding):
-            current_spread = df.iloc[i]['spread']
-            ma = df.iloc[i]['spread_ma']
-            std = df.iloc[i]['spread_std']
-            
-            # Z-score
-            z_score = (current_spread - ma) / std
-            
-            # Entry when spread deviates significantly
-            if abs(z_score) > threshold:
-                entry_date = df.iloc[i]['date']
-                entry_spread = current_spread
-                
-                # Exit after holding period
-                exit_idx = min(i + holding, len(df) - 1)
-                exit_date = df.iloc[exit_idx]['date']
-                exit_spread = df.iloc[exit_idx]['spread']
-                
-                # Long spread if z < 0, short if z > 0
-                if z_score < 0:
-                    pnl = (exit_spread - entry_spread) / entry_spread * 100
-                else:
-                    pnl = (entry_spread - exit_spread) / entry_spread * 100
-                
-                trades.append({
-                    'entry_date': entry_date,
-                    'entry_spread': entry_spread,
-                    'exit_date': exit_date,
-                    'exit_spread': exit_spread,
-                    'z_score': z_score,
-                    'return': pnl,
-                    'holding_days': (exit_date - entry_date).days
-                })
-        
-        return pd.DataFrame(trades)
-    
-    def calculate_performance_metrics(self, trades_df):
-        """
-        Calculate comprehensive performance metrics
-        """
-        if len(trades_df) == 0:
-            return {}
-        
-        returns = trades_df['return'].values
-        
-        metrics = {
-            'total_trades': len(trades_df),
-            'win_rate': (returns > 0).sum() / len(returns) * 100,
-            'avg_return': returns.mean(),
-            'total_return': returns.sum(),
-            'best_trade': returns.max(),
-            'worst_trade': returns.min(),
-            'sharpe_ratio': returns.mean() / returns.std() if returns.std() > 0 else 0,
-            'max_drawdown': self._calculate_max_drawdown(returns),
-            'profit_factor': abs(returns[returns > 0].sum() / returns[returns < 0].sum()) 
-                            if (returns < 0).any() else np.inf
-        }
-        
-        return metrics
-    
-    def _calculate_max_drawdown(self, returns):
-        """
-        Calculate maximum drawdown
-        """
-        cumulative = (1 + returns / 100).cumprod()
-        running_max = np.maximum.accumulate(cumulative)
-        drawdown = (cumulative - running_max) / running_max * 100
-        return drawdown.min()
-    
-    def plot_performance(self, trades_df, title='Strategy Performance'):
-        """
-        Visualize strategy performance
-        """
-        fig, axes = plt.subplots(2, 2, figsize=(15, 10))
-        fig.suptitle(title, fontsize=16, fontweight='bold')
-        
-        returns = trades_df['return'].values
-        cumulative = (1 + returns / 100).cumprod()
-        
-        # Cumulative P&L
-        axes[0, 0].plot(cumulative, linewidth=2, color='#2563eb')
-        axes[0, 0].axhline(y=1, color='red', linestyle='--', alpha=0.5)
-        axes[0, 0].set_title('Cumulative Returns', fontweight='bold')
-        axes[0, 0].set_xlabel('Trade Number')
-        axes[0, 0].set_ylabel('Cumulative Return')
-        axes[0, 0].grid(True, alpha=0.3)
-        
-        # Drawdown
-        running_max = np.maximum.accumulate(cumulative)
-        drawdown = (cumulative - running_max) / running_max * 100
-        axes[0, 1].fill_between(range(len(drawdown)), drawdown, 0, 
-                                color='red', alpha=0.3)
-        axes[0, 1].set_title('Drawdown', fontweight='bold')
-        axes[0, 1].set_xlabel('Trade Number')
-        axes[0, 1].set_ylabel('Drawdown (%)')
-        axes[0, 1].grid(True, alpha=0.3)
-        
-        # Return distribution
-        axes[1, 0].hist(returns, bins=30, color='#10b981', alpha=0.7, edgecolor='black')
-        axes[1, 0].axvline(x=0, color='red', linestyle='--', linewidth=2)
-        axes[1, 0].set_title('Return Distribution', fontweight='bold')
-        axes[1, 0].set_xlabel('Return (%)')
-        axes[1, 0].set_ylabel('Frequency')
-        axes[1, 0].grid(True, alpha=0.3)
-        
-        # Win/Loss analysis
-        wins = (returns > 0).sum()
-        losses = (returns <= 0).sum()
-        axes[1, 1].bar(['Wins', 'Losses'], [wins, losses], 
-                      color=['#10b981', '#ef4444'], alpha=0.7, edgecolor='black')
-        axes[1, 1].set_title('Win/Loss Count', fontweight='bold')
-        axes[1, 1].set_ylabel('Number of Trades')
-        axes[1, 1].grid(True, alpha=0.3, axis='y')
-        
-        plt.tight_layout()
-        plt.savefig('backtest_performance.png', dpi=300, bbox_inches='tight')
-        print("✓ Saved performance chart: backtest_performance.png")
-        plt.close()
-    
-    def generate_performance_report(self, trades_df, strategy_name):
-        """
-        Print detailed performance report
-        """
-        metrics = self.calculate_performance_metrics(trades_df)
-        
-        print("\n" + "="*70)
-        print(f"BACKTEST PERFORMANCE REPORT: {strategy_name}")
-        print("="*70)
-        print(f"\nTotal Trades:        {metrics['total_trades']}")
-        print(f"Win Rate:            {metrics['win_rate']:.2f}%")
-        print(f"Average Return:      {metrics['avg_return']:+.2f}%")
-        print(f"Total Return:        {metrics['total_return']:+.2f}%")
-        print(f"Best Trade:          {metrics['best_trade']:+.2f}%")
-        print(f"Worst Trade:         {metrics['worst_trade']:+.2f}%")
-        print(f"Sharpe Ratio:        {metrics['sharpe_ratio']:.2f}")
-        print(f"Max Drawdown:        {metrics['max_drawdown']:.2f}%")
-        print(f"Profit Factor:       {metrics['profit_factor']:.2f}")
-        print("="*70)
-
-
-# Example usage
-if __name__ == "__main__":
-    backtester = TradeBacktester()
-    
-    # Test momentum strategy
-    print("\nRunning Momentum Strategy Backtest...")
-    momentum_trades = backtester.momentum_strategy(metal='copper', lookback=20, holding=60)
-    backtester.generate_performance_report(momentum_trades, "Copper Momentum (20/60)")
-    backtester.plot_performance(momentum_trades, "Copper Momentum Strategy")
-    
-    # Test spread strategy
-    print("\nRunning Spread Strategy Backtest...")
-    spread_trades = backtester.spread_strategy(metal1='copper', metal2='aluminum')
-    backtester.generate_performance_report(spread_trades, "Copper/Aluminum Spread")
-    backtester.plot_performance(spread_trades, "Copper/Aluminum Spread Strategy")
-    
-    # Save trades to CSV
-    momentum_trades.to_csv('momentum_trades.csv', index=False)
-    spread_trades.to_csv('spread_trades.csv', index=False)
-    print("\n✓ Saved trade logs to CSV files")
\ No newline at end of file
+"""
+Trade Idea Backtesting & Performance Analysis
+Professional-grade backtesting for metals trading strategies
+"""
+
+import pandas as pd
+import numpy as np
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from multiprocessing import shared_memory
+
+try:
+    from scripts.master_dataset import MASTER_DATASET, load_master_dataset
+except ImportError:
+    from master_dataset import MASTER_DATASET, load_master_dataset
+
+try:
+    from scripts.backtest_engine import METALS, EventBacktester
+except ImportError:
+    from backtest_engine import METALS, EventBacktester
+
+try:
+    from scripts.performance_metrics import equity_metrics
+except ImportError:
+    from performance_metrics import equity_metrics
+
+try:
+    from scripts.bootstrap import bootstrap_trades
+except ImportError:
+    from bootstrap import bootstrap_trades
+
+try:
+    from scripts.pairs_scanner import scan_pairs
+except ImportError:
+    from pairs_scanner import scan_pairs
+
+# Strategy parameter defaults used by walk_forward's rolling-statistics kernel
+ROLLING_DEFAULTS = {
+    'momentum_strategy': {'metal': 'copper', 'lookback': 20, 'holding': 60},
+    'spread_strategy': {'metal1': 'copper', 'metal2': 'aluminum', 'threshold': 0.1,
+                        'holding': 40, 'window': 60, 'overlapping': True},
+}
+
+
+class TradeBacktester:
+    """
+    Backtest trading strategies and generate performance metrics
+    """
+    
+    def __init__(self, data_file=MASTER_DATASET, df=None):
+        self.df = df if df is not None else load_master_dataset(data_file)
+        self.trades = []
+    
+    def momentum_strategy(self, metal='copper', lookback=20, holding=60, vectorized=True):
+        """
+        Simple momentum strategy: Buy when price > MA, sell when < MA
+        """
+        if vectorized:
+            return self._momentum_strategy_vectorized(metal, lookback, holding)
+        
+        df = self.df.copy()
+        df[f'{metal}_ma'] = df[metal].rolling(lookback).mean()
+        
+        trades = []
+        position = None
+        
+        for i in range(lookback, len(df) - holding):
+            current_price = df.iloc[i][metal]
+            ma_price = df.iloc[i][f'{metal}_ma']
+            
+            # Entry signal
+            if position is None and current_price > ma_price:
+                entry_date = df.iloc[i]['date']
+                entry_price = current_price
+                
+                # Exit after holding period
+                exit_idx = min(i + holding, len(df) - 1)
+                exit_date = df.iloc[exit_idx]['date']
+                exit_price = df.iloc[exit_idx][metal]
+                
+                pnl = (exit_price - entry_price) / entry_price * 100
+                
+                trades.append({
+                    'entry_date': entry_date,
+                    'entry_price': entry_price,
+                    'exit_date': exit_date,
+                    'exit_price': exit_price,
+                    'return': pnl,
+                    'holding_days': (exit_date - entry_date).days
+                })
+                
+                position = None  # Reset after exit
+        
+        return pd.DataFrame(trades)
+    
+    def _momentum_strategy_vectorized(self, metal, lookback, holding):
+        """
+        Array implementation of momentum_strategy: entry mask, exit indices
+        and returns are computed in one pass instead of per-row iloc lookups
+        """
+        prices = self.df[metal].to_numpy(dtype=np.float64)
+        ma = self.df[metal].rolling(lookback).mean().to_numpy(dtype=np.float64)
+        n = len(prices)
+        
+        candidates = np.arange(lookback, n - holding)
+        if len(candidates) == 0:
+            return pd.DataFrame()
+        
+        entry_idx = candidates[prices[candidates] > ma[candidates]]
+        if len(entry_idx) == 0:
+            return pd.DataFrame()
+        
+        exit_idx = np.minimum(entry_idx + holding, n - 1)
+        returns = (prices[exit_idx] - prices[entry_idx]) / prices[entry_idx] * 100
+        
+        return self._build_trades_frame(entry_idx, exit_idx, 'price', prices, returns)
+    
+    def _build_trades_frame(self, entry_idx, exit_idx, value_name, values, returns, extra=None):
+        """
+        Assemble a trades DataFrame from entry/exit row indices, with the
+        same columns and dtypes the row-by-row strategies produce
+        """
+        dates = self.df['date'].to_numpy()
+        entry_dates = pd.DatetimeIndex(dates[entry_idx])
+        exit_dates = pd.DatetimeIndex(dates[exit_idx])
+        
+        frame = {
+            'entry_date': entry_dates,
+            f'entry_{value_name}': values[entry_idx],
+            'exit_date': exit_dates,
+            f'exit_{value_name}': values[exit_idx],
+        }
+        frame.update(extra or {})
+        frame['return'] = returns
+        frame['holding_days'] = (exit_dates - entry_dates).days.to_numpy(dtype=np.int64)
+        
+        return pd.DataFrame(frame)
+    
+    def spread_strategy(self, metal1='copper', metal2='aluminum', 
+                       threshold=0.1, holding=40, window=60,
+                       overlapping=True, vectorized=True):
+        """
+        Mean reversion spread strategy
+        
+        By default a trade is opened on every bar where |z| > threshold.
+        With overlapping=False a new trade is only opened once the previous
+        one has reached its exit bar.
+        """
+        if vectorized:
+            return self._spread_strategy_vectorized(
+                metal1, metal2, threshold, holding, window, overlapping
+            )
+        
+        df = self.df.copy()
+        df['spread'] = df[metal1] / df[metal2]
+        df['spread_ma'] = df['spread'].rolling(window).mean()
+        df['spread_std'] = df['spread'].rolling(window).std()
+        
+        trades = []
+        next_entry = 0
+        
+        for i in range(window, len(df) - holding):
+            if not overlapping and i < next_entry:
+                continue
+            
+            current_spread = df.iloc[i]['spread']
+            ma = df.iloc[i]['spread_ma']
+            std = df.iloc[i]['spread_std']
+            
+            # Z-score
+            z_score = (current_spread - ma) / std
+            
+            # Entry when spread deviates significantly
+            if abs(z_score) > threshold:
+                entry_date = df.iloc[i]['date']
+                entry_spread = current_spread
+                
+                # Exit after holding period
+                exit_idx = min(i + holding, len(df) - 1)
+                exit_date = df.iloc[exit_idx]['date']
+                exit_spread = df.iloc[exit_idx]['spread']
+                next_entry = exit_idx
+                
+                # Long spread if z < 0, short if z > 0
+                if z_score < 0:
+                    pnl = (exit_spread - entry_spread) / entry_spread * 100
+                else:
+                    pnl = (entry_spread - exit_spread) / entry_spread * 100
+                
+                trades.append({
+                    'entry_date': entry_date,
+                    'entry_spread': entry_spread,
+                    'exit_date': exit_date,
+                    'exit_spread': exit_spread,
+                    'z_score': z_score,
+                    'return': pnl,
+                    'holding_days': (exit_date - entry_date).days
+                })
+        
+        return pd.DataFrame(trades)
+    
+    def _spread_strategy_vectorized(self, metal1, metal2, threshold, holding,
+                                    window, overlapping):
+        """
+        Array implementation of spread_strategy on contiguous float64 arrays
+        """
+        spread = np.ascontiguousarray(
+            self.df[metal1].to_numpy(dtype=np.float64) /
+            self.df[metal2].to_numpy(dtype=np.float64)
+        )
+        z_scores = self._rolling_zscore(spread, window)
+        n = len(spread)
+        
+        candidates = np.arange(window, n - holding)
+        if len(candidates) == 0:
+            return pd.DataFrame()
+        
+        entry_idx = candidates[np.abs(z_scores[candidates]) > threshold]
+        if not overlapping:
+            entry_idx = self._non_overlapping_entries(entry_idx, holding)
+        if len(entry_idx) == 0:
+            return pd.DataFrame()
+        
+        exit_idx = np.minimum(entry_idx + holding, n - 1)
+        entry_spread = spread[entry_idx]
+        exit_spread = spread[exit_idx]
+        z = z_scores[entry_idx]
+        
+        # Long spread if z < 0, short if z > 0
+        returns = np.where(
+            z < 0,
+            (exit_spread - entry_spread) / entry_spread * 100,
+            (entry_spread - exit_spread) / entry_spread * 100
+        )
+        
+        return self._build_trades_frame(
+            entry_idx, exit_idx, 'spread', spread, returns, extra={'z_score': z}
+        )
+    
+    def _rolling_zscore(self, values, window):
+        """
+        Rolling z-score of a float64 array against its trailing mean/std
+        """
+        rolling = pd.Series(values, copy=False).rolling(window)
+        ma = rolling.mean().to_numpy()
+        std = rolling.std().to_numpy()
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return (values - ma) / std
+    
+    def _non_overlapping_entries(self, entry_idx, holding):
+        """
+        Keep only signal bars that fall on or after the previous trade's exit
+        """
+        selected = []
+        pos = 0
+        
+        while pos < len(entry_idx):
+            selected.append(pos)
+            pos = np.searchsorted(entry_idx, entry_idx[pos] + holding, side='left')
+        
+        return entry_idx[selected]
+    
+    def run_event_backtest(self, strategies):
+        """
+        Run strategies (backtest_engine.Strategy instances) bar by bar on
+        this dataset with position state, stops/targets and daily MTM
+        equity; returns EventBacktester.run() results
+        """
+        engine = EventBacktester(df=self.df)
+        for strategy in strategies:
+            engine.add_strategy(strategy)
+        return engine.run()
+    
+    def calculate_equity_metrics(self, results):
+        """
+        Time-based metrics per strategy from run_event_backtest results:
+        annualized Sharpe/Sortino, Calmar, drawdown depth and duration,
+        exposure and turnover (one row per strategy)
+        
+        Unlike calculate_performance_metrics these come from the daily
+        equity curve, so overlapping trades are not double-counted.
+        """
+        return equity_metrics(results['equity'], exposure=results['exposure'],
+                              turnover=results['turnover'])
+    
+    def bootstrap_metrics(self, trades_df, n_paths=10000, block_size=5, confidence=0.95,
+                          workers=1):
+        """
+        Block-bootstrap confidence intervals for win rate, Sharpe, max
+        drawdown and total return of a trades_df (see bootstrap.bootstrap)
+        """
+        return bootstrap_trades(trades_df, n_paths=n_paths, block_size=block_size,
+                                confidence=confidence, workers=workers)['summary']
+    
+    def scan_pairs(self, metals=None, **kwargs):
+        """
+        Rank every metal pair (optionally FX-adjusted) by spread z-score,
+        half-life and cointegration; see pairs_scanner.scan_pairs
+        """
+        return scan_pairs(self.df, instruments=metals or METALS, **kwargs)
+    
+    def calculate_performance_metrics(self, trades_df):
+        """
+        Calculate comprehensive performance metrics
+        """
+        if len(trades_df) == 0:
+            return {}
+        
+        return self._returns_metrics(trades_df['return'].to_numpy(dtype=np.float64))
+    
+    def _returns_metrics(self, returns):
+        """
+        calculate_performance_metrics on an array of per-trade returns (%)
+        """
+        if len(returns) == 0:
+            return {}
+        
+        metrics = {
+            'total_trades': len(returns),
+            'win_rate': (returns > 0).sum() / len(returns) * 100,
+            'avg_return': returns.mean(),
+            'total_return': returns.sum(),
+            'best_trade': returns.max(),
+            'worst_trade': returns.min(),
+            'sharpe_ratio': returns.mean() / returns.std() if returns.std() > 0 else 0,
+            'max_drawdown': self._calculate_max_drawdown(returns),
+            'profit_factor': abs(returns[returns > 0].sum() / returns[returns < 0].sum()) 
+                            if (returns < 0).any() else np.inf
+        }
+        
+        return metrics
+    
+    def sweep(self, strategy, grid, workers=None):
+        """
+        Evaluate every parameter combination in grid for a strategy
+        
+        strategy: 'momentum' or 'spread' (or the full method name)
+        grid: dict of parameter name -> list of values, e.g.
+              {'lookback': [10, 20, 50], 'holding': [20, 40, 60]}
+        workers: number of processes (None = all cores, 1 = in-process)
+        
+        Workers read the price matrix from shared memory rather than
+        receiving a pickled copy of self.df. Returns one row of
+        calculate_performance_metrics per combination.
+        """
+        strategy = strategy if strategy.endswith('_strategy') else f'{strategy}_strategy'
+        if not hasattr(self, strategy):
+            raise ValueError(f"Unknown strategy: {strategy}")
+        
+        names = list(grid)
+        combos = [dict(zip(names, values))
+                  for values in itertools.product(*(grid[name] for name in names))]
+        
+        if workers == 1:
+            rows = [self._evaluate_params(strategy, params) for params in combos]
+            return pd.DataFrame(rows)
+        
+        rows = self._map_shared(_run_sweep_task, itertools.repeat(strategy), combos,
+                                workers=workers)
+        return pd.DataFrame(rows)
+    
+    def _map_shared(self, func, *iterables, workers=None):
+        """
+        pool.map(func, *iterables) in worker processes that read the price
+        matrix from shared memory (see _attach_sweep_worker)
+        """
+        numeric = self.df.drop(columns=['date']).select_dtypes(include='number')
+        dates = self.df['date'].to_numpy(dtype='datetime64[ns]')
+        
+        matrix_shm = shared_memory.SharedMemory(create=True, size=max(numeric.size * 8, 1))
+        dates_shm = shared_memory.SharedMemory(create=True, size=max(dates.nbytes, 1))
+        try:
+            # Column-major so each price series is contiguous for the strategies
+            np.ndarray(numeric.shape, dtype=np.float64, buffer=matrix_shm.buf,
+                       order='F')[:] = numeric.to_numpy(dtype=np.float64)
+            np.ndarray(dates.shape, dtype=dates.dtype, buffer=dates_shm.buf)[:] = dates
+            
+            initargs = (
+                (matrix_shm.name, numeric.shape, np.float64, 'F'),
+                (dates_shm.name, dates.shape, dates.dtype, 'C'),
+                list(numeric.columns),
+            )
+            with ProcessPoolExecutor(max_workers=workers,
+                                     initializer=_attach_sweep_worker,
+                                     initargs=initargs) as pool:
+                return list(pool.map(func, *iterables))
+        finally:
+            matrix_shm.close()
+            matrix_shm.unlink()
+            dates_shm.close()
+            dates_shm.unlink()
+    
+    def _evaluate_params(self, strategy, params):
+        """
+        Run a strategy with one parameter set and return params + metrics
+        """
+        trades_df = getattr(self, strategy)(**params)
+        row = dict(params)
+        row.update(self.calculate_performance_metrics(trades_df))
+        return row
+    
+    def walk_forward(self, strategy, grid, train_days=504, test_days=126,
+                     objective='sharpe_ratio', workers=None):
+        """
+        Walk-forward optimization over rolling train/test windows
+        
+        History is split into folds of train_days followed by test_days
+        (the window then rolls forward by test_days). Each fold picks the
+        grid combination with the best calculate_performance_metrics
+        objective on trades entered in its training window, then trades
+        the next test window with it. Rolling MAs and z-scores are computed
+        once over the full history and sliced per fold, so indicators see
+        the same warm-up data as an in-sample run.
+        
+        strategy, grid: as for sweep()
+        workers: processes for the folds (None = all cores, 1 = in-process)
+        
+        Returns {'folds': DataFrame (windows, chosen parameters, train
+        objective and test metrics per fold), 'trades': stitched
+        out-of-sample trades, 'equity': daily out-of-sample equity curve,
+        'metrics': equity_metrics of that curve}.
+        """
+        strategy = strategy if strategy.endswith('_strategy') else f'{strategy}_strategy'
+        if strategy not in ROLLING_DEFAULTS:
+            raise ValueError(f"Walk-forward not supported for: {strategy}")
+        
+        names = list(grid)
+        combos = [dict(zip(names, values))
+                  for values in itertools.product(*(grid[name] for name in names))]
+        
+        n = len(self.df)
+        folds = [(start, start + train_days, start + train_days,
+                  min(start + train_days + test_days, n))
+                 for start in range(0, n - train_days, test_days)]
+        if not folds:
+            raise ValueError(f"Need more than {train_days} rows for walk-forward")
+        
+        if workers == 1:
+            cache = {}
+            results = [self._walk_forward_fold(strategy, combos, fold, objective, cache)
+                       for fold in folds]
+        else:
+            results = self._map_shared(_run_walk_forward_task, itertools.repeat(strategy),
+                                       itertools.repeat(combos), folds,
+                                       itertools.repeat(objective), workers=workers)
+        
+        return self._stitch_walk_forward(strategy, results, folds, objective)
+    
+    def _rolling_inputs(self, strategy, params, cache):
+        """
+        Full-history traded series and signal statistic for a parameter
+        set (prices and MA, or spread and z-score), memoized in cache
+        """
+        params = {**ROLLING_DEFAULTS[strategy], **params}
+        if strategy == 'momentum_strategy':
+            key = (strategy, params['metal'], params['lookback'])
+        else:
+            key = (strategy, params['metal1'], params['metal2'], params['window'])
+        
+        if key not in cache:
+            if strategy == 'momentum_strategy':
+                values = self.df[params['metal']].to_numpy(dtype=np.float64)
+                signal = self.df[params['metal']].rolling(params['lookback']).mean() \
+                    .to_numpy(dtype=np.float64)
+            else:
+                values = np.ascontiguousarray(
+                    self.df[params['metal1']].to_numpy(dtype=np.float64) /
+                    self.df[params['metal2']].to_numpy(dtype=np.float64)
+                )
+                signal = self._rolling_zscore(values, params['window'])
+            cache[key] = (values, signal)
+        
+        return params, cache[key]
+    
+    def _window_trades(self, strategy, params, start, end, cache):
+        """
+        Trades a strategy enters in rows [start, end) that also exit by
+        end - 1, from the cached full-history rolling statistics
+        
+        Returns (entry_idx, exit_idx, direction, returns %, traded values);
+        with start=0, end=len(df) these are the vectorized strategy's trades.
+        """
+        params, (values, signal) = self._rolling_inputs(strategy, params, cache)
+        holding = params['holding']
+        warmup = params['lookback'] if strategy == 'momentum_strategy' else params['window']
+        
+        candidates = np.arange(max(start, warmup), end - holding)
+        if strategy == 'momentum_strategy':
+            entry_idx = candidates[values[candidates] > signal[candidates]]
+            direction = np.ones(len(entry_idx))
+        else:
+            entry_idx = candidates[np.abs(signal[candidates]) > params['threshold']]
+            if not params['overlapping']:
+                entry_idx = self._non_overlapping_entries(entry_idx, holding)
+            # Long spread if z < 0, short if z > 0
+            direction = np.where(signal[entry_idx] < 0, 1.0, -1.0)
+        
+        exit_idx = entry_idx + holding
+        returns = direction * (values[exit_idx] - values[entry_idx]) / values[entry_idx] * 100
+        return entry_idx, exit_idx, direction, returns, values
+    
+    def _walk_forward_fold(self, strategy, combos, fold, objective, cache):
+        """
+        Optimize on one fold's training window and trade its test window
+        """
+        train_start, train_end, test_start, test_end = fold
+        
+        best_params, best_score = combos[0], -np.inf
+        for params in combos:
+            returns = self._window_trades(strategy, params, train_start, train_end, cache)[3]
+            score = self._returns_metrics(returns).get(objective, np.nan)
+            if score > best_score:
+                best_params, best_score = params, score
+        
+        entry_idx, exit_idx, direction, returns, _ = self._window_trades(
+            strategy, best_params, test_start, test_end, cache
+        )
+        return {
+            'params': best_params,
+            'train_score': best_score if np.isfinite(best_score) else np.nan,
+            'test_metrics': self._returns_metrics(returns),
+            'entry_idx': entry_idx,
+            'exit_idx': exit_idx,
+            'direction': direction,
+            'returns': returns,
+        }
+    
+    def _stitch_walk_forward(self, strategy, results, folds, objective):
+        """
+        Combine per-fold test trades into one out-of-sample trade log and
+        a daily equity curve
+        
+        Each trade holds 1/holding of capital from entry to exit (at most
+        holding trades overlap when one opens per bar), so the curve marks
+        every open trade to market daily instead of compounding
+        overlapping trade returns.
+        """
+        dates = self.df['date'].to_numpy()
+        n = len(dates)
+        daily_returns = np.zeros(n)
+        cache = {}
+        rows, trades = [], []
+        value_name = 'price' if strategy == 'momentum_strategy' else 'spread'
+        
+        for number, (fold, result) in enumerate(zip(folds, results)):
+            params, (values, _) = self._rolling_inputs(strategy, result['params'], cache)
+            entry_idx, exit_idx = result['entry_idx'], result['exit_idx']
+            
+            # Position per bar from +/- weight steps at entries and exits
+            weight = result['direction'] / params['holding']
+            steps = np.zeros(n + 1)
+            np.add.at(steps, entry_idx + 1, weight)
+            np.add.at(steps, exit_idx + 1, -weight)
+            position = np.cumsum(steps)[:n]
+            daily_returns[1:] += position[1:] * (values[1:] / values[:-1] - 1.0)
+            
+            row = {'fold': number,
+                   'train_start': dates[fold[0]], 'train_end': dates[fold[1] - 1],
+                   'test_start': dates[fold[2]], 'test_end': dates[fold[3] - 1]}
+            row.update(result['params'])
+            row[f'train_{objective}'] = result['train_score']
+            row.update({f'test_{key}': value for key, value in result['test_metrics'].items()})
+            rows.append(row)
+            
+            if len(entry_idx):
+                fold_trades = self._build_trades_frame(entry_idx, exit_idx, value_name,
+                                                       values, result['returns'])
+                fold_trades.insert(0, 'fold', number)
+                trades.append(fold_trades)
+        
+        first, last = folds[0][2], folds[-1][3]
+        equity = pd.Series(np.cumprod(1.0 + daily_returns[first:last]),
+                           index=pd.DatetimeIndex(dates[first:last]), name='equity')
+        
+        return {
+            'folds': pd.DataFrame(rows),
+            'trades': pd.concat(trades, ignore_index=True) if trades else pd.DataFrame(),
+            'equity': equity,
+            'metrics': equity_metrics(equity.to_numpy()),
+        }
+    
+    def _calculate_max_drawdown(self, returns):
+        """
+        Calculate maximum drawdown
+        """
+        cumulative = (1 + returns / 100).cumprod()
+        running_max = np.maximum.accumulate(cumulative)
+        drawdown = (cumulative - running_max) / running_max * 100
+        return drawdown.min()
+    
+    def plot_performance(self, trades_df, title='Strategy Performance'):
+        """
+        Visualize strategy performance
+        """
+        import matplotlib.pyplot as plt
+        
+        fig, axes = plt.subplots(2, 2, figsize=(15, 10))
+        fig.suptitle(title, fontsize=16, fontweight='bold')
+        
+        returns = trades_df['return'].values
+        cumulative = (1 + returns / 100).cumprod()
+        
+        # Cumulative P&L
+        axes[0, 0].plot(cumulative, linewidth=2, color='#2563eb')
+        axes[0, 0].axhline(y=1, color='red', linestyle='--', alpha=0.5)
+        axes[0, 0].set_title('Cumulative Returns', fontweight='bold')
+        axes[0, 0].set_xlabel('Trade Number')
+        axes[0, 0].set_ylabel('Cumulative Return')
+        axes[0, 0].grid(True, alpha=0.3)
+        
+        # Drawdown
+        running_max = np.maximum.accumulate(cumulative)
+        drawdown = (cumulative - running_max) / running_max * 100
+        axes[0, 1].fill_between(range(len(drawdown)), drawdown, 0, 
+                                color='red', alpha=0.3)
+        axes[0, 1].set_title('Drawdown', fontweight='bold')
+        axes[0, 1].set_xlabel('Trade Number')
+        axes[0, 1].set_ylabel('Drawdown (%)')
+        axes[0, 1].grid(True, alpha=0.3)
+        
+        # Return distribution
+        axes[1, 0].hist(returns, bins=30, color='#10b981', alpha=0.7, edgecolor='black')
+        axes[1, 0].axvline(x=0, color='red', linestyle='--', linewidth=2)
+        axes[1, 0].set_title('Return Distribution', fontweight='bold')
+        axes[1, 0].set_xlabel('Return (%)')
+        axes[1, 0].set_ylabel('Frequency')
+        axes[1, 0].grid(True, alpha=0.3)
+        
+        # Win/Loss analysis
+        wins = (returns > 0).sum()
+        losses = (returns <= 0).sum()
+        axes[1, 1].bar(['Wins', 'Losses'], [wins, losses], 
+                      color=['#10b981', '#ef4444'], alpha=0.7, edgecolor='black')
+        axes[1, 1].set_title('Win/Loss Count', fontweight='bold')
+        axes[1, 1].set_ylabel('Number of Trades')
+        axes[1, 1].grid(True, alpha=0.3, axis='y')
+        
+        plt.tight_layout()
+        plt.savefig('backtest_performance.png', dpi=300, bbox_inches='tight')
+        print("✓ Saved performance chart: backtest_performance.png")
+        plt.close()
+    
+    def generate_performance_report(self, trades_df, strategy_name):
+        """
+        Print detailed performance report
+        """
+        metrics = self.calculate_performance_metrics(trades_df)
+        
+        print("\n" + "="*70)
+        print(f"BACKTEST PERFORMANCE REPORT: {strategy_name}")
+        print("="*70)
+        print(f"\nTotal Trades:        {metrics['total_trades']}")
+        print(f"Win Rate:            {metrics['win_rate']:.2f}%")
+        print(f"Average Return:      {metrics['avg_return']:+.2f}%")
+        print(f"Total Return:        {metrics['total_return']:+.2f}%")
+        print(f"Best Trade:          {metrics['best_trade']:+.2f}%")
+        print(f"Worst Trade:         {metrics['worst_trade']:+.2f}%")
+        print(f"Sharpe Ratio:        {metrics['sharpe_ratio']:.2f}")
+        print(f"Max Drawdown:        {metrics['max_drawdown']:.2f}%")
+        print(f"Profit Factor:       {metrics['profit_factor']:.2f}")
+        print("="*70)
+
+
+# Per-process backtester attached to the sweep's shared price matrix
+_SWEEP_WORKER = {}
+
+
+def _attach_sweep_worker(matrix_spec, dates_spec, columns):
+    """
+    Pool initializer: map the shared price matrix and dates into this process
+    """
+    buffers = []
+    arrays = []
+    for name, shape, dtype, order in (matrix_spec, dates_spec):
+        shm = shared_memory.SharedMemory(name=name)
+        buffers.append(shm)
+        arrays.append(np.ndarray(shape, dtype=dtype, buffer=shm.buf, order=order))
+    
+    matrix, dates = arrays
+    df = pd.DataFrame(matrix, columns=columns, copy=False)
+    df.insert(0, 'date', pd.DatetimeIndex(dates))
+    
+    _SWEEP_WORKER['buffers'] = buffers
+    _SWEEP_WORKER['backtester'] = TradeBacktester(df=df)
+
+
+def _run_sweep_task(strategy, params):
+    """
+    Run one parameter combination inside a sweep worker
+    """
+    return _SWEEP_WORKER['backtester']._evaluate_params(strategy, params)
+
+
+def _run_walk_forward_task(strategy, combos, fold, objective):
+    """
+    Optimize and test one walk-forward fold inside a worker; rolling
+    statistics are cached per process and reused by its later folds
+    """
+    cache = _SWEEP_WORKER.setdefault('rolling_cache', {})
+    return _SWEEP_WORKER['backtester']._walk_forward_fold(strategy, combos, fold,
+                                                          objective, cache)
+
+# Example usage
+def main(df=None):
+    """
+    Run the copper momentum and copper/aluminum spread backtests
+    
+    df: master dataset already in memory (read from disk when None)
+    """
+    backtester = TradeBacktester(df=df)
+    
+    # Test momentum strategy
+    print("\nRunning Momentum Strategy Backtest...")
+    momentum_trades = backtester.momentum_strategy(metal='copper', lookback=20, holding=60)
+    backtester.generate_performance_report(momentum_trades, "Copper Momentum (20/60)")
+    backtester.plot_performance(momentum_trades, "Copper Momentum Strategy")
+    
+    # Test spread strategy
+    print("\nRunning Spread Strategy Backtest...")
+    spread_trades = backtester.spread_strategy(metal1='copper', metal2='aluminum')
+    backtester.generate_performance_report(spread_trades, "Copper/Aluminum Spread")
+    backtester.plot_performance(spread_trades, "Copper/Aluminum Spread Strategy")
+    
+    # Save trades to CSV
+    momentum_trades.to_csv('momentum_trades.csv', index=False)
+    spread_trades.to_csv('spread_trades.csv', index=False)
+    print("\n✓ Saved trade logs to CSV files")
+    
+    return {'momentum': momentum_trades, 'spread': spread_trades}
+
+
+if __name__ == "__main__":
+    main()
@@ -1,327 +1,995 @@
-"""
-Trade Lifecycle & Operations Management System
-Simulates trade booking, tracking, and management
-"""
-
-import pandas as pd
-import uuid
-from datetime import datetime, timedelta
-import json
-
-class TradeManagementSystem:
-    """
-    Complete trade lifecycle management
-    """
-    
-    def __init__(self):
-        self.trades = []
-        self.trade_history = []
-        
-    def generate_trade_id(self):
-        """Generate unique trade ID"""
-        return f"TRD{datetime.now().strftime('%Y%m%d')}{str(uuid.uuid4())[:6].upper()}"
-    
-    def book_directional_trade(self,
-                              counterparty,
-                              metal,
-                              direction,
-                              entry_price,
-                              notional,
-                              target_price=None,
-                              stop_price=None,
-                              rationale=""):
-        """
-        Book a directional metals trade
-        """
-        trade_id = self.generate_trade_id()
-        
-        trade = {
-            'trade_id': trade_id,
-            'trade_type': 'Directional',
-            'product': metal,
-            'direction': direction,
-            'counterparty': counterparty,
-            'entry_price': entry_price,
-            'target_price': target_price,
-            'stop_price': stop_price,
-            'notional': notional,
-            'entry_date': datetime.now().strftime('%Y-%m-%d'),
-            'exit_date': None,
-            'exit_price': None,
-            'status': 'Proposed',
-            'pnl': 0,
-            'rationale': rationale,
-            'last_updated': datetime.now().isoformat()
-        }
-        
-        self.trades.append(trade)
-        self._log_action(trade_id, 'BOOKED', trade)
-        
-        print(f"✓ Trade booked: {trade_id}")
-        return trade_id
-    
-    def book_spread_trade(self,
-                         counterparty,
-                         long_metal,
-                         short_metal,
-                         entry_ratio,
-                         notional,
-                         target_ratio=None,
-                         stop_ratio=None,
-                         rationale=""):
-        """
-        Book a spread trade
-        """
-        trade_id = self.generate_trade_id()
-        
-        trade = {
-            'trade_id': trade_id,
-            'trade_type': 'Spread',
-            'product': f'{long_metal}/{short_metal}',
-            'long_leg': long_metal,
-            'short_leg': short_metal,
-            'counterparty': counterparty,
-            'entry_ratio': entry_ratio,
-            'target_ratio': target_ratio,
-            'stop_ratio': stop_ratio,
-            'notional': notional,
-            'entry_date': datetime.now().strftime('%Y-%m-%d'),
-            'exit_date': None,
-            'exit_ratio': None,
-            'status': 'Proposed',
-            'pnl': 0,
-            'rationale': rationale,
-            'last_updated': datetime.now().isoformat()
-        }
-        
-        self.trades.append(trade)
-        self._log_action(trade_id, 'BOOKED', trade)
-        
-        print(f"✓ Spread trade booked: {trade_id}")
-        return trade_id
-    
-    def update_trade_status(self, trade_id, new_status):
-        """
-        Update trade status (Proposed → Executed → Settled)
-        """
-        trade = self._find_trade(trade_id)
-        if not trade:
-            print(f"✗ Trade {trade_id} not found")
-            return False
-        
-        old_status = trade['status']
-        trade['status'] = new_status
-        trade['last_updated'] = datetime.now().isoformat()
-        
-        self._log_action(trade_id, f'STATUS_CHANGE: {old_status} → {new_status}', trade)
-        
-        print(f"✓ {trade_id} status updated: {old_status} → {new_status}")
-        return True
-    
-    def execute_trade(self, trade_id):
-        """
-        Mark trade as executed
-        """
-        return self.update_trade_status(trade_id, 'Executed')
-    
-    def close_trade(self, trade_id, exit_price_or_ratio, current_market_price=None):
-        """
-        Close a trade and calculate P&L
-        """
-        trade = self._find_trade(trade_id)
-        if not trade:
-            print(f"✗ Trade {trade_id} not found")
-            return False
-        
-        if trade['trade_type'] == 'Directional':
-            trade['exit_price'] = exit_price_or_ratio
-            entry = trade['entry_price']
-            exit_p = exit_price_or_ratio
-            
-            if trade['direction'].lower() == 'long':
-                pnl = (exit_p - entry) / entry * trade['notional']
-            else:
-                pnl = (entry - exit_p) / entry * trade['notional']
-            
-            trade['pnl'] = pnl
-            
-        elif trade['trade_type'] == 'Spread':
-            trade['exit_ratio'] = exit_price_or_ratio
-            pnl = (exit_price_or_ratio - trade['entry_ratio']) / trade['entry_ratio'] * trade['notional']
-            trade['pnl'] = pnl
-        
-        trade['exit_date'] = datetime.now().strftime('%Y-%m-%d')
-        trade['status'] = 'Closed'
-        trade['last_updated'] = datetime.now().isoformat()
-        
-        self._log_action(trade_id, 'CLOSED', trade)
-        
-        print(f"✓ {trade_id} closed | P&L: ${pnl:,.2f}")
-        return True
-    
-    def get_portfolio_summary(self):
-        """
-        Get current portfolio summary
-        """
-        if not self.trades:
-            return {'total_trades': 0, 'active': 0, 'closed': 0, 'total_pnl': 0}
-        
-        df = pd.DataFrame(self.trades)
-        
-        summary = {
-            'total_trades': len(df),
-            'proposed': len(df[df['status'] == 'Proposed']),
-            'executed': len(df[df['status'] == 'Executed']),
-            'closed': len(df[df['status'] == 'Closed']),
-            'total_pnl': df[df['status'] == 'Closed']['pnl'].sum(),
-            'total_notional': df['notional'].sum(),
-            'avg_trade_size': df['notional'].mean()
-        }
-        
-        return summary
-    
-    def get_trades_by_status(self, status):
-        """
-        Get all trades with specific status
-        """
-        return [t for t in self.trades if t['status'] == status]
-    
-    def get_trades_by_counterparty(self, counterparty):
-        """
-        Get all trades for specific counterparty
-        """
-        return [t for t in self.trades if t['counterparty'] == counterparty]
-    
-    def export_trades_to_csv(self, filename='trades_export.csv'):
-        """
-        Export all trades to CSV
-        """
-        if not self.trades:
-            print("No trades to export")
-            return
-        
-        df = pd.DataFrame(self.trades)
-        df.to_csv(filename, index=False)
-        print(f"✓ Exported {len(df)} trades to {filename}")
-    
-    def generate_trade_blotter(self):
-        """
-        Generate trade blotter (daily trade log)
-        """
-        if not self.trades:
-            print("No trades in system")
-            return pd.DataFrame()
-        
-        df = pd.DataFrame(self.trades)
-        
-        # Blotter columns
-        blotter_cols = [
-            'trade_id', 'entry_date', 'trade_type', 'product',
-            'counterparty', 'notional', 'status', 'pnl'
-        ]
-        
-        blotter = df[blotter_cols].copy()
-        blotter['pnl'] = blotter['pnl'].apply(lambda x: f"${x:,.2f}" if pd.notna(x) else "$0.00")
-        
-        return blotter
-    
-    def _find_trade(self, trade_id):
-        """Find trade by ID"""
-        for trade in self.trades:
-            if trade['trade_id'] == trade_id:
-                return trade
-        return None
-    
-    def _log_action(self, trade_id, action, trade_data):
-        """Log all trade actions"""
-        log_entry = {
-            'timestamp': datetime.now().isoformat(),
-            'trade_id': trade_id,
-            'action': action,
-            'data': trade_data.copy()
-        }
-        self.trade_history.append(log_entry)
-    
-    def print_portfolio_summary(self):
-        """
-        Print formatted portfolio summary
-        """
-        summary = self.get_portfolio_summary()
-        
-        print("\n" + "="*70)
-        print("PORTFOLIO SUMMARY")
-        print("="*70)
-        print(f"Total Trades:          {summary['total_trades']}")
-        print(f"  • Proposed:          {summary['proposed']}")
-        print(f"  • Executed:          {summary['executed']}")
-        print(f"  • Closed:            {summary['closed']}")
-        print(f"\nTotal Notional:        ${summary['total_notional']:,.0f}")
-        print(f"Average Trade Size:    ${summary['avg_trade_size']:,.0f}")
-        print(f"Total P&L (Closed):    ${summary['total_pnl']:,.2f}")
-        print("="*70 + "\n")
-
-
-# Example usage
-if __name__ == "__main__":
-    tms = TradeManagementSystem()
-    
-    # Book some trades
-    print("Booking trades...\n")
-    
-    trade1 = tms.book_directional_trade(
-        counterparty="China Steel Corp",
-        metal="Copper",
-        direction="Long",
-        entry_price=8650,
-        notional=1000000,
-        target_price=9200,
-        stop_price=8400,
-        rationale="China PMI recovery + weaker USD outlook"
-    )
-    
-    trade2 = tms.book_spread_trade(
-        counterparty="Mumbai Metals Ltd",
-        long_metal="Copper",
-        short_metal="Aluminum",
-        entry_ratio=3.76,
-        notional=500000,
-        target_ratio=4.00,
-        stop_ratio=3.60,
-        rationale="Infrastructure theme favors copper over aluminum"
-    )
-    
-    trade3 = tms.book_directional_trade(
-        counterparty="Tokyo Trading Co",
-        metal="Gold",
-        direction="Long",
-        entry_price=2050,
-        notional=750000,
-        target_price=2100,
-        rationale="Safe haven demand on rate cut expectations"
-    )
-    
-    # Execute trades
-    print("\nExecuting trades...\n")
-    tms.execute_trade(trade1)
-    tms.execute_trade(trade2)
-    
-    # Close a trade
-    print("\nClosing trades...\n")
-    tms.close_trade(trade1, exit_price_or_ratio=8950)
-    
-    # Portfolio summary
-    tms.print_portfolio_summary()
-    
-    # Trade blotter
-    print("TRADE BLOTTER")
-    print("="*70)
-    blotter = tms.generate_trade_blotter()
-    print(blotter.to_string(index=False))
-    
-    # Export
-    tms.export_trades_to_csv()
-    
-    # Save trade history
-    with open('trade_history.json', 'w') as f:
-        json.dump(tms.trade_history, f, indent=2)
-    print("\n✓ Saved trade history to trade_history.json")
\ No newline at end of file
+"""
+Trade Lifecycle & Operations Management System
+Simulates trade booking, tracking, and management
+"""
+
+import pandas as pd
+import numpy as np
+import uuid
+import os
+import glob
+from collections import deque
+from datetime import datetime, timedelta
+from types import MappingProxyType
+import json
+
+try:
+    from scripts.master_dataset import MASTER_DATASET, load_master_dataset, master_dataset_columns
+except ImportError:
+    from master_dataset import MASTER_DATASET, load_master_dataset, master_dataset_columns
+
+class TradeStore:
+    """
+    Columnar trade book with a hash index on trade_id and secondary
+    indexes on status, counterparty and product
+    
+    Each field lives in one typed array: float64 for prices/ratios/P&L,
+    datetime64 for dates and int32 category codes for repeated strings
+    (metal, status, counterparty, ...). Trades are handed out as dict
+    snapshots; all changes must go through update() so the arrays and
+    indexes stay consistent.
+    """
+    
+    FLOAT_FIELDS = ('entry_price', 'target_price', 'stop_price', 'exit_price',
+                    'entry_ratio', 'target_ratio', 'stop_ratio', 'exit_ratio',
+                    'notional', 'pnl', 'mark', 'unrealized_pnl')
+    CATEGORY_FIELDS = ('trade_type', 'product', 'direction', 'long_leg', 'short_leg',
+                       'counterparty', 'status', 'rationale')
+    DATE_FIELDS = ('entry_date', 'exit_date')
+    TIMESTAMP_FIELDS = ('last_updated',)
+    INDEXED_FIELDS = ('status', 'counterparty', 'product')
+    
+    # Field order of the booked trade dicts, per trade type
+    DIRECTIONAL_FIELDS = ('trade_id', 'trade_type', 'product', 'direction', 'counterparty',
+                          'entry_price', 'target_price', 'stop_price', 'notional',
+                          'entry_date', 'exit_date', 'exit_price', 'status', 'pnl',
+                          'mark', 'unrealized_pnl', 'rationale', 'last_updated')
+    SPREAD_FIELDS = ('trade_id', 'trade_type', 'product', 'long_leg', 'short_leg',
+                     'counterparty', 'entry_ratio', 'target_ratio', 'stop_ratio', 'notional',
+                     'entry_date', 'exit_date', 'exit_ratio', 'status', 'pnl',
+                     'mark', 'unrealized_pnl', 'rationale', 'last_updated')
+    FRAME_COLUMNS = ('trade_id', 'trade_type', 'product', 'direction', 'long_leg', 'short_leg',
+                     'counterparty', 'entry_price', 'target_price', 'stop_price',
+                     'entry_ratio', 'target_ratio', 'stop_ratio', 'notional',
+                     'entry_date', 'exit_date', 'exit_price', 'exit_ratio', 'status', 'pnl',
+                     'mark', 'unrealized_pnl', 'rationale', 'last_updated')
+    
+    def __init__(self, capacity=1024):
+        self._n = 0
+        self._columns = {'trade_id': np.empty(capacity, dtype=object)}
+        for field in self.FLOAT_FIELDS:
+            self._columns[field] = np.full(capacity, np.nan)
+        for field in self.CATEGORY_FIELDS:
+            self._columns[field] = np.full(capacity, -1, dtype=np.int32)
+        for field in self.DATE_FIELDS:
+            self._columns[field] = np.full(capacity, np.datetime64('NaT'), dtype='datetime64[s]')
+        for field in self.TIMESTAMP_FIELDS:
+            self._columns[field] = np.full(capacity, np.datetime64('NaT'), dtype='datetime64[us]')
+        
+        self._categories = {field: [] for field in self.CATEGORY_FIELDS}
+        self._category_codes = {field: {} for field in self.CATEGORY_FIELDS}
+        self._by_id = {}
+        self._indexes = {field: {} for field in self.INDEXED_FIELDS}
+    
+    def __len__(self):
+        return self._n
+    
+    def __contains__(self, trade_id):
+        return trade_id in self._by_id
+    
+    @property
+    def trades(self):
+        """All trades as dict snapshots, in booking order"""
+        return self.records()
+    
+    def records(self, rows=None):
+        """
+        Dict snapshots for many rows at once (default: all, in booking order)
+        
+        Decodes column by column instead of field by field, so it matches
+        _snapshot() but is much cheaper for large batches.
+        """
+        rows = np.arange(self._n) if rows is None else np.asarray(rows, dtype=np.intp)
+        decoded = {'trade_id': self._columns['trade_id'][rows].tolist()}
+        for field in self.FLOAT_FIELDS:
+            values = self._columns[field][rows]
+            decoded[field] = np.where(np.isnan(values), None, values).tolist()
+        for field in self.CATEGORY_FIELDS:
+            lookup = np.array(self._categories[field] + [None], dtype=object)
+            decoded[field] = lookup[self._columns[field][rows]].tolist()
+        for field in self.DATE_FIELDS:
+            values = self._columns[field][rows]
+            text = np.datetime_as_string(values, unit='D').astype(object)
+            text[np.isnat(values)] = None
+            decoded[field] = text.tolist()
+        for field in self.TIMESTAMP_FIELDS:
+            decoded[field] = [None if value is None else value.isoformat()
+                              for value in self._columns[field][rows].tolist()]
+        
+        spread_code = self._category_codes['trade_type'].get('Spread', -2)
+        is_spread = (self._columns['trade_type'][rows] == spread_code).tolist()
+        spread_columns = [decoded[field] for field in self.SPREAD_FIELDS]
+        directional_columns = [decoded[field] for field in self.DIRECTIONAL_FIELDS]
+        
+        return [dict(zip(self.SPREAD_FIELDS, [column[i] for column in spread_columns]))
+                if spread else
+                dict(zip(self.DIRECTIONAL_FIELDS, [column[i] for column in directional_columns]))
+                for i, spread in enumerate(is_spread)]
+    
+    def add(self, trade):
+        """Add a newly booked trade"""
+        trade_id = trade['trade_id']
+        if trade_id in self._by_id:
+            raise ValueError(f"Duplicate trade_id: {trade_id}")
+        
+        self._ensure_capacity()
+        row = self._n
+        self._n += 1
+        self._by_id[trade_id] = row
+        
+        for field, value in trade.items():
+            self._set(row, field, value)
+        for field in self.INDEXED_FIELDS:
+            code = self._columns[field][row]
+            self._indexes[field].setdefault(code, {})[row] = None
+    
+    def get(self, trade_id):
+        """Return a snapshot of the trade with trade_id, or None"""
+        row = self._by_id.get(trade_id)
+        return None if row is None else self._snapshot(row)
+    
+    def update(self, trade_id, **changes):
+        """Apply field changes to a trade, moving it between index buckets"""
+        row = self._by_id[trade_id]
+        
+        for field, value in changes.items():
+            if field in self._indexes:
+                old_code = self._columns[field][row]
+                self._set(row, field, value)
+                new_code = self._columns[field][row]
+                if new_code != old_code:
+                    bucket = self._indexes[field][old_code]
+                    del bucket[row]
+                    if not bucket:
+                        del self._indexes[field][old_code]
+                    self._indexes[field].setdefault(new_code, {})[row] = None
+            else:
+                self._set(row, field, value)
+        
+        return self._snapshot(row)
+    
+    def assign(self, field, rows, values):
+        """Vectorized write of a non-indexed float field for many rows"""
+        if field not in self.FLOAT_FIELDS:
+            raise KeyError(f"assign() only supports float fields, not {field}")
+        self._columns[field][rows] = values
+    
+    def value(self, trade_id, field):
+        """Read a single field without building a full snapshot"""
+        return self._snapshot_field(self._by_id[trade_id], field)
+    
+    def find(self, field, value):
+        """Return trades where an indexed field equals value, in booking order"""
+        code = self._category_codes[field].get(value)
+        rows = self._indexes[field].get(code, {})
+        return self.records(sorted(rows))
+    
+    def count(self, field, value):
+        """Number of trades where an indexed field equals value"""
+        code = self._category_codes[field].get(value)
+        return len(self._indexes[field].get(code, {}))
+    
+    def column(self, field):
+        """Zero-copy view of one field's array (category fields as codes)"""
+        return self._columns[field][:self._n]
+    
+    def to_frame(self, columns=None):
+        """
+        DataFrame over the trade arrays
+        
+        Numeric and date columns are views of the store's arrays (no copy)
+        and category fields come back as pandas Categoricals. Treat the
+        result as a read-only snapshot.
+        """
+        data = {}
+        for field in columns or self.FRAME_COLUMNS:
+            values = self._columns[field][:self._n]
+            if field in self._categories:
+                values = pd.Categorical.from_codes(values, categories=self._categories[field])
+            data[field] = values
+        
+        return pd.DataFrame(data, copy=False)
+    
+    def memory_usage(self):
+        """Bytes held by the trade arrays (excluding spare capacity)"""
+        n = self._n
+        total = sum(arr[:n].nbytes for arr in self._columns.values())
+        total += sum(len(trade_id) for trade_id in self._by_id)
+        return total
+    
+    def check_indexes(self):
+        """Verify every index against a full scan of the arrays"""
+        for field in self.INDEXED_FIELDS:
+            codes = self.column(field)
+            expected = {code: set(np.flatnonzero(codes == code)) for code in np.unique(codes)}
+            actual = {code: set(rows) for code, rows in self._indexes[field].items()}
+            if expected != actual:
+                return False
+        return len(self._by_id) == self._n
+    
+    def _ensure_capacity(self):
+        capacity = len(self._columns['trade_id'])
+        if self._n < capacity:
+            return
+        
+        for field, arr in self._columns.items():
+            grown = np.empty(capacity * 2, dtype=arr.dtype)
+            grown[:capacity] = arr
+            grown[capacity:] = self._empty_value(field, arr.dtype)
+            self._columns[field] = grown
+    
+    def _empty_value(self, field, dtype):
+        if field in self._categories:
+            return -1
+        if dtype.kind == 'M':
+            return np.datetime64('NaT')
+        if dtype.kind == 'f':
+            return np.nan
+        return None
+    
+    def _set(self, row, field, value):
+        """Encode value into the field's array"""
+        if field in self._categories:
+            if value is None:
+                code = -1
+            else:
+                code = self._category_codes[field].get(value)
+                if code is None:
+                    code = len(self._categories[field])
+                    self._categories[field].append(value)
+                    self._category_codes[field][value] = code
+            self._columns[field][row] = code
+        elif field in self.DATE_FIELDS or field in self.TIMESTAMP_FIELDS:
+            self._columns[field][row] = np.datetime64('NaT') if value is None else value
+        elif field in self.FLOAT_FIELDS:
+            self._columns[field][row] = np.nan if value is None else value
+        elif field == 'trade_id':
+            self._columns[field][row] = value
+        else:
+            raise KeyError(f"Unknown trade field: {field}")
+    
+    def _snapshot(self, row):
+        """Decode one row back into the booked trade dict"""
+        trade_type = self._snapshot_field(row, 'trade_type')
+        fields = self.SPREAD_FIELDS if trade_type == 'Spread' else self.DIRECTIONAL_FIELDS
+        return {field: self._snapshot_field(row, field) for field in fields}
+    
+    def _snapshot_field(self, row, field):
+        # ndarray.item returns Python objects (float, int, datetime or None for NaT)
+        value = self._columns[field].item(row)
+        if field in self._categories:
+            return None if value < 0 else self._categories[field][value]
+        if field in self.DATE_FIELDS:
+            return None if value is None else value.strftime('%Y-%m-%d')
+        if field in self.TIMESTAMP_FIELDS:
+            return None if value is None else value.isoformat()
+        if field in self.FLOAT_FIELDS and value != value:
+            return None
+        return value
+
+
+class PortfolioAggregates:
+    """
+    Running portfolio aggregates, updated in O(1) on every lifecycle event
+    
+    Each bucket (whole book, per counterparty, per metal/product) tracks
+    trade count, notional, and trade count and P&L per status, so realized
+    P&L is simply the P&L held in the 'Closed' status.
+    """
+    
+    def __init__(self):
+        self.totals = self._empty_bucket()
+        self.by_counterparty = {}
+        self.by_metal = {}
+    
+    @staticmethod
+    def _empty_bucket():
+        return {'trades': 0, 'notional': 0.0, 'status_counts': {}, 'status_pnl': {}}
+    
+    def _buckets(self, counterparty, product):
+        if counterparty not in self.by_counterparty:
+            self.by_counterparty[counterparty] = self._empty_bucket()
+        if product not in self.by_metal:
+            self.by_metal[product] = self._empty_bucket()
+        return (self.totals, self.by_counterparty[counterparty], self.by_metal[product])
+    
+    def add_trade(self, counterparty, product, notional, status, pnl=0.0):
+        """Account for a newly booked trade"""
+        for bucket in self._buckets(counterparty, product):
+            bucket['trades'] += 1
+            bucket['notional'] += notional
+            bucket['status_counts'][status] = bucket['status_counts'].get(status, 0) + 1
+            bucket['status_pnl'][status] = bucket['status_pnl'].get(status, 0.0) + pnl
+    
+    def change_status(self, counterparty, product, old_status, new_status, old_pnl, new_pnl):
+        """Move a trade (and its P&L) from one status to another"""
+        for bucket in self._buckets(counterparty, product):
+            counts, pnl = bucket['status_counts'], bucket['status_pnl']
+            counts[old_status] -= 1
+            pnl[old_status] -= old_pnl
+            counts[new_status] = counts.get(new_status, 0) + 1
+            pnl[new_status] = pnl.get(new_status, 0.0) + new_pnl
+    
+    def summary(self, bucket=None):
+        """Summary dict (get_portfolio_summary keys) for one bucket"""
+        bucket = bucket or self.totals
+        counts = bucket['status_counts']
+        
+        return {
+            'total_trades': bucket['trades'],
+            'proposed': counts.get('Proposed', 0),
+            'executed': counts.get('Executed', 0),
+            'closed': counts.get('Closed', 0),
+            'total_pnl': bucket['status_pnl'].get('Closed', 0.0),
+            'total_notional': bucket['notional'],
+            'avg_trade_size': bucket['notional'] / bucket['trades'] if bucket['trades'] else 0.0
+        }
+    
+    def grouped_summary(self, by='counterparty'):
+        """One summary row per counterparty or metal"""
+        groups = self.by_counterparty if by == 'counterparty' else self.by_metal
+        rows = [dict({by: key}, **self.summary(bucket))
+                for key, bucket in groups.items() if bucket['trades']]
+        return pd.DataFrame(rows)
+
+
+class TradeJournal:
+    """
+    Append-only, on-disk trade journal
+    
+    Entries are JSON lines holding only the fields an action changed.
+    The journal is split into segments; every segment starts with a full
+    snapshot of the book, so startup replay only reads the newest segment.
+    Writes are buffered and fsync'd every sync_every entries (a crash can
+    lose at most the last unsynced batch); older segments are kept as the
+    audit trail unless keep_segments is set.
+    """
+    
+    def __init__(self, journal_dir, sync_every=64, snapshot_every=10000, keep_segments=None):
+        self.journal_dir = journal_dir
+        self.sync_every = sync_every
+        self.snapshot_every = snapshot_every
+        self.keep_segments = keep_segments
+        os.makedirs(journal_dir, exist_ok=True)
+        
+        self.seq = 0
+        self._file = None
+        self._unsynced = 0
+        self._segment_entries = 0
+    
+    def segments(self):
+        """Segment paths, oldest first"""
+        return sorted(glob.glob(os.path.join(self.journal_dir, 'journal-*.jsonl')))
+    
+    def replay(self):
+        """
+        Read the newest segment and open it for appending
+        
+        Returns (snapshot_trades, entries). A torn final line left by a
+        crash mid-write is dropped and truncated away.
+        """
+        segments = self.segments()
+        if not segments:
+            return [], []
+        
+        path = segments[-1]
+        snapshot, entries, good_bytes = None, [], 0
+        with open(path, 'rb') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    if f.read():
+                        raise ValueError(f"Corrupt journal entry in {path} at byte {good_bytes}")
+                    break
+                if not line.endswith(b'\n'):
+                    break
+                good_bytes += len(line)
+                if snapshot is None:
+                    snapshot = record
+                else:
+                    entries.append(record)
+        
+        if os.path.getsize(path) != good_bytes:
+            with open(path, 'r+b') as f:
+                f.truncate(good_bytes)
+        
+        self.seq = entries[-1]['seq'] if entries else snapshot['seq']
+        self._segment_entries = len(entries)
+        self._file = open(path, 'a', encoding='utf-8')
+        return snapshot['trades'], entries
+    
+    def append(self, entry):
+        """Append one entry; returns it with its sequence number"""
+        if self._file is None:
+            self.write_snapshot([])
+        
+        self.seq += 1
+        entry = dict(entry, seq=self.seq)
+        self._file.write(json.dumps(entry, default=_json_default) + '\n')
+        self._segment_entries += 1
+        self._unsynced += 1
+        if self._unsynced >= self.sync_every:
+            self.sync()
+        return entry
+    
+    def needs_snapshot(self, book_size=0):
+        """
+        Due once the segment holds snapshot_every entries, or as many
+        entries as the book holds trades if that is larger, so snapshot
+        cost stays proportional to the entries written
+        """
+        return self._segment_entries >= max(self.snapshot_every, book_size)
+    
+    def write_snapshot(self, trades):
+        """Start a new segment whose first line is a full snapshot of trades"""
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+        
+        path = os.path.join(self.journal_dir, f'journal-{self.seq:012d}.jsonl')
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'seq': self.seq, 'trades': trades}, default=_json_default) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        
+        self._file = open(path, 'a', encoding='utf-8')
+        self._segment_entries = 0
+        
+        if self.keep_segments:
+            for old in self.segments()[:-self.keep_segments]:
+                os.remove(old)
+    
+    def sync(self):
+        """Flush buffered entries and fsync them to disk"""
+        if self._file is not None and self._unsynced:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+    
+    def close(self):
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+
+def _json_default(value):
+    # NumPy scalars (e.g. prices taken from a DataFrame) -> Python numbers
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Not JSON serializable: {type(value).__name__}")
+
+
+class TradeManagementSystem:
+    """
+    Complete trade lifecycle management
+    """
+    
+    OPEN_STATUSES = ('Executed', 'Settled')
+    
+    def __init__(self, journal_dir=None, history_limit=1000, sync_every=64, snapshot_every=10000):
+        """
+        journal_dir: persist every action to a TradeJournal in this directory
+        and rebuild the book from it on startup (None keeps trades in memory only)
+        history_limit: number of recent actions kept in trade_history
+        """
+        self.store = TradeStore()
+        self.aggregates = PortfolioAggregates()
+        self.trade_history = deque(maxlen=history_limit)
+        self.journal = None
+        
+        if journal_dir is not None:
+            self.journal = TradeJournal(journal_dir, sync_every=sync_every,
+                                        snapshot_every=snapshot_every)
+            self._replay_journal()
+    
+    @property
+    def trades(self):
+        """
+        All trades in booking order, as read-only snapshots; change trades
+        through the lifecycle methods (update_trade_status, close_trade, ...)
+        """
+        return tuple(MappingProxyType(trade) for trade in self.store.trades)
+        
+    def generate_trade_id(self):
+        """Generate unique trade ID"""
+        while True:
+            trade_id = f"TRD{datetime.now().strftime('%Y%m%d')}{str(uuid.uuid4())[:6].upper()}"
+            if trade_id not in self.store:
+                return trade_id
+    
+    def book_directional_trade(self,
+                              counterparty,
+                              metal,
+                              direction,
+                              entry_price,
+                              notional,
+                              target_price=None,
+                              stop_price=None,
+                              rationale=""):
+        """
+        Book a directional metals trade
+        """
+        trade_id = self.generate_trade_id()
+        
+        trade = {
+            'trade_id': trade_id,
+            'trade_type': 'Directional',
+            'product': metal,
+            'direction': direction,
+            'counterparty': counterparty,
+            'entry_price': entry_price,
+            'target_price': target_price,
+            'stop_price': stop_price,
+            'notional': notional,
+            'entry_date': datetime.now().strftime('%Y-%m-%d'),
+            'exit_date': None,
+            'exit_price': None,
+            'status': 'Proposed',
+            'pnl': 0,
+            'rationale': rationale,
+            'last_updated': datetime.now().isoformat()
+        }
+        
+        self.store.add(trade)
+        self.aggregates.add_trade(counterparty, trade['product'], notional, trade['status'])
+        self._log_action(trade_id, 'BOOKED', trade)
+        
+        print(f"✓ Trade booked: {trade_id}")
+        return trade_id
+    
+    def book_spread_trade(self,
+                         counterparty,
+                         long_metal,
+                         short_metal,
+                         entry_ratio,
+                         notional,
+                         target_ratio=None,
+                         stop_ratio=None,
+                         rationale=""):
+        """
+        Book a spread trade
+        """
+        trade_id = self.generate_trade_id()
+        
+        trade = {
+            'trade_id': trade_id,
+            'trade_type': 'Spread',
+            'product': f'{long_metal}/{short_metal}',
+            'long_leg': long_metal,
+            'short_leg': short_metal,
+            'counterparty': counterparty,
+            'entry_ratio': entry_ratio,
+            'target_ratio': target_ratio,
+            'stop_ratio': stop_ratio,
+            'notional': notional,
+            'entry_date': datetime.now().strftime('%Y-%m-%d'),
+            'exit_date': None,
+            'exit_ratio': None,
+            'status': 'Proposed',
+            'pnl': 0,
+            'rationale': rationale,
+            'last_updated': datetime.now().isoformat()
+        }
+        
+        self.store.add(trade)
+        self.aggregates.add_trade(counterparty, trade['product'], notional, trade['status'])
+        self._log_action(trade_id, 'BOOKED', trade)
+        
+        print(f"✓ Spread trade booked: {trade_id}")
+        return trade_id
+    
+    def update_trade_status(self, trade_id, new_status):
+        """
+        Update trade status (Proposed → Executed → Settled)
+        """
+        if trade_id not in self.store:
+            print(f"✗ Trade {trade_id} not found")
+            return False
+        
+        old_status = self.store.value(trade_id, 'status')
+        trade = self.store.update(trade_id, status=new_status,
+                                  last_updated=datetime.now().isoformat())
+        self.aggregates.change_status(trade['counterparty'], trade['product'],
+                                      old_status, new_status, trade['pnl'], trade['pnl'])
+        
+        self._log_action(trade_id, f'STATUS_CHANGE: {old_status} → {new_status}',
+                         {'status': new_status, 'last_updated': trade['last_updated']})
+        
+        print(f"✓ {trade_id} status updated: {old_status} → {new_status}")
+        return True
+    
+    def execute_trade(self, trade_id):
+        """
+        Mark trade as executed
+        """
+        return self.update_trade_status(trade_id, 'Executed')
+    
+    def close_trade(self, trade_id, exit_price_or_ratio, current_market_price=None):
+        """
+        Close a trade and calculate P&L
+        """
+        trade = self._find_trade(trade_id)
+        if not trade:
+            print(f"✗ Trade {trade_id} not found")
+            return False
+        
+        changes = {}
+        
+        if trade['trade_type'] == 'Directional':
+            changes['exit_price'] = exit_price_or_ratio
+            entry = trade['entry_price']
+            exit_p = exit_price_or_ratio
+            
+            if trade['direction'].lower() == 'long':
+                pnl = (exit_p - entry) / entry * trade['notional']
+            else:
+                pnl = (entry - exit_p) / entry * trade['notional']
+            
+            changes['pnl'] = pnl
+            
+        elif trade['trade_type'] == 'Spread':
+            changes['exit_ratio'] = exit_price_or_ratio
+            pnl = (exit_price_or_ratio - trade['entry_ratio']) / trade['entry_ratio'] * trade['notional']
+            changes['pnl'] = pnl
+        
+        # Clearing the mark-to-market P&L is journaled too, so a replay on
+        # top of a snapshot taken while the trade was marked stays in sync
+        changes.update(exit_date=datetime.now().strftime('%Y-%m-%d'),
+                       status='Closed',
+                       unrealized_pnl=None,
+                       last_updated=datetime.now().isoformat())
+        
+        old_status, old_pnl = trade['status'], trade['pnl']
+        trade = self.store.update(trade_id, **changes)
+        self.aggregates.change_status(trade['counterparty'], trade['product'],
+                                      old_status, 'Closed', old_pnl, pnl)
+        
+        self._log_action(trade_id, 'CLOSED', changes)
+        
+        print(f"✓ {trade_id} closed | P&L: ${pnl:,.2f}")
+        return True
+    
+    def get_portfolio_summary(self):
+        """
+        Get current portfolio summary
+        """
+        if not len(self.store):
+            return {'total_trades': 0, 'active': 0, 'closed': 0, 'total_pnl': 0}
+        
+        summary = self.aggregates.summary()
+        summary['unrealized_pnl'] = float(np.nansum(self.store.column('unrealized_pnl')))
+        return summary
+    
+    def get_grouped_summary(self, by='counterparty'):
+        """
+        Portfolio summary per counterparty or per metal ('metal')
+        """
+        return self.aggregates.grouped_summary(by)
+    
+    def check_aggregates(self, rtol=1e-9):
+        """
+        Compare the running aggregates against a full recompute from the
+        trade book; returns True when every bucket matches
+        """
+        df = self.store.to_frame(['counterparty', 'product', 'status', 'notional', 'pnl'])
+        
+        def recompute(rows):
+            closed = rows['status'] == 'Closed'
+            return {
+                'total_trades': len(rows),
+                'proposed': int((rows['status'] == 'Proposed').sum()),
+                'executed': int((rows['status'] == 'Executed').sum()),
+                'closed': int(closed.sum()),
+                'total_pnl': rows.loc[closed, 'pnl'].sum(),
+                'total_notional': rows['notional'].sum(),
+                'avg_trade_size': rows['notional'].mean() if len(rows) else 0.0
+            }
+        
+        expected = [(self.aggregates.totals, recompute(df))]
+        for key, bucket in self.aggregates.by_counterparty.items():
+            expected.append((bucket, recompute(df[df['counterparty'] == key])))
+        for key, bucket in self.aggregates.by_metal.items():
+            expected.append((bucket, recompute(df[df['product'] == key])))
+        
+        for bucket, full in expected:
+            running = self.aggregates.summary(bucket)
+            for field, value in full.items():
+                if not np.isclose(running[field], value, rtol=rtol, atol=1e-6):
+                    return False
+        return True
+    
+    def mark_to_market(self, market_data=MASTER_DATASET, as_of=None):
+        """
+        Value every open (Executed/Settled) trade at the latest prices
+        
+        market_data: master dataset path or DataFrame
+        as_of: use the latest observations on or before this date
+        
+        Directional trades are marked at the metal's price column and spreads
+        at the matching ratio column (e.g. copper_aluminum_spread), falling
+        back to long/short prices. Marks and unrealized P&L are computed for
+        the whole book in one array pass and stored on the trades; returns
+        the marked open trades.
+        """
+        store = self.store
+        products = store._categories['product']
+        directions = store._categories['direction']
+        long_legs = store._categories['long_leg']
+        short_legs = store._categories['short_leg']
+        
+        # Latest value for every column we could need
+        ratio_columns = {}
+        for long_leg in long_legs:
+            for short_leg in short_legs:
+                pair = f'{long_leg}_{short_leg}'.lower()
+                ratio_columns[f'{long_leg}/{short_leg}'] = (f'{pair}_spread', f'{pair}_ratio')
+        
+        if isinstance(market_data, pd.DataFrame):
+            df = market_data
+            if as_of is not None:
+                df = df[pd.to_datetime(df['date']) <= pd.Timestamp(as_of)]
+        else:
+            wanted = {product.lower() for product in products if '/' not in product}
+            wanted.update(leg.lower() for leg in long_legs + short_legs)
+            wanted.update(name for names in ratio_columns.values() for name in names)
+            wanted &= set(master_dataset_columns(market_data))
+            df = load_master_dataset(market_data, columns=sorted(wanted), end_date=as_of)
+        
+        latest = df.drop(columns='date').ffill().iloc[-1] if len(df) else pd.Series(dtype=float)
+        
+        def latest_value(*columns):
+            for column in columns:
+                if column in latest.index and pd.notna(latest[column]):
+                    return float(latest[column])
+            return np.nan
+        
+        # One mark per product category code (last slot maps code -1 to NaN)
+        mark_by_code = np.full(len(products) + 1, np.nan)
+        for code, product in enumerate(products):
+            if '/' in product:
+                long_leg, short_leg = product.split('/', 1)
+                ratio = latest_value(*ratio_columns.get(product, ()))
+                if np.isnan(ratio):
+                    ratio = latest_value(long_leg.lower()) / latest_value(short_leg.lower())
+                mark_by_code[code] = ratio
+            else:
+                mark_by_code[code] = latest_value(product.lower())
+        
+        sign_by_code = np.ones(len(directions) + 1)
+        for code, direction in enumerate(directions):
+            if direction.lower() != 'long':
+                sign_by_code[code] = -1.0
+        
+        # Whole-book array pass
+        status_codes = store.column('status')
+        open_codes = [store._category_codes['status'][status]
+                      for status in self.OPEN_STATUSES if status in store._category_codes['status']]
+        is_open = np.isin(status_codes, open_codes)
+        
+        is_spread = store.column('trade_type') == store._category_codes['trade_type'].get('Spread', -2)
+        entry = np.where(is_spread, store.column('entry_ratio'), store.column('entry_price'))
+        sign = np.where(is_spread, 1.0, sign_by_code[store.column('direction')])
+        mark = mark_by_code[store.column('product')]
+        unrealized = sign * (mark - entry) / entry * store.column('notional')
+        
+        rows = np.flatnonzero(is_open)
+        store.assign('mark', rows, mark[rows])
+        store.assign('unrealized_pnl', slice(None, len(store)), np.where(is_open, unrealized, np.nan))
+        
+        columns = ['trade_id', 'trade_type', 'product', 'direction', 'counterparty',
+                   'notional', 'status', 'entry_price', 'entry_ratio', 'mark', 'unrealized_pnl']
+        return store.to_frame(columns)[is_open].reset_index(drop=True)
+    
+    def get_trades_by_status(self, status):
+        """
+        Get all trades with specific status
+        """
+        return self.store.find('status', status)
+    
+    def get_trades_by_counterparty(self, counterparty):
+        """
+        Get all trades for specific counterparty
+        """
+        return self.store.find('counterparty', counterparty)
+    
+    def get_trades_by_product(self, product):
+        """
+        Get all trades for specific product (metal or spread pair)
+        """
+        return self.store.find('product', product)
+    
+    def export_trades_to_csv(self, filename='trades_export.csv'):
+        """
+        Export all trades to CSV
+        """
+        if not len(self.store):
+            print("No trades to export")
+            return
+        
+        # Columns in booking-dict order (as first seen across trade types)
+        # with ISO timestamps; the mark-to-market columns go last
+        df = pd.DataFrame(self.store.records())
+        mtm_columns = ['mark', 'unrealized_pnl']
+        df = df[[column for column in df.columns if column not in mtm_columns] + mtm_columns]
+        df.to_csv(filename, index=False)
+        print(f"✓ Exported {len(df)} trades to {filename}")
+    
+    def generate_trade_blotter(self):
+        """
+        Generate trade blotter (daily trade log)
+        """
+        if not len(self.store):
+            print("No trades in system")
+            return pd.DataFrame()
+        
+        # Blotter columns
+        blotter_cols = [
+            'trade_id', 'entry_date', 'trade_type', 'product',
+            'counterparty', 'notional', 'status', 'pnl'
+        ]
+        
+        blotter = self.store.to_frame(blotter_cols)
+        blotter['pnl'] = blotter['pnl'].apply(lambda x: f"${x:,.2f}" if pd.notna(x) else "$0.00")
+        
+        return blotter
+    
+    def _find_trade(self, trade_id):
+        """Find trade by ID"""
+        return self.store.get(trade_id)
+    
+    def _log_action(self, trade_id, action, changes):
+        """Log a trade action (only the fields it changed) to history and the journal"""
+        log_entry = {
+            'timestamp': datetime.now().isoformat(),
+            'trade_id': trade_id,
+            'action': action,
+            'changes': changes
+        }
+        if self.journal is not None:
+            log_entry = self.journal.append(log_entry)
+            if self.journal.needs_snapshot(len(self.store)):
+                self.journal.write_snapshot(self.store.trades)
+        self.trade_history.append(log_entry)
+    
+    def _replay_journal(self):
+        """Rebuild the trade book and aggregates from the journal"""
+        trades, entries = self.journal.replay()
+        
+        for trade in trades:
+            self.store.add(trade)
+            self.aggregates.add_trade(trade['counterparty'], trade['product'],
+                                      trade['notional'], trade['status'], trade['pnl'] or 0.0)
+        
+        for entry in entries:
+            changes = entry['changes']
+            if entry['action'] == 'BOOKED':
+                self.store.add(changes)
+                self.aggregates.add_trade(changes['counterparty'], changes['product'],
+                                          changes['notional'], changes['status'])
+            else:
+                trade_id = entry['trade_id']
+                old_status = self.store.value(trade_id, 'status')
+                old_pnl = self.store.value(trade_id, 'pnl')
+                trade = self.store.update(trade_id, **changes)
+                self.aggregates.change_status(trade['counterparty'], trade['product'],
+                                              old_status, trade['status'], old_pnl, trade['pnl'])
+            self.trade_history.append(entry)
+        
+        if trades or entries:
+            print(f"✓ Replayed {len(self.store)} trades from {self.journal.journal_dir}")
+    
+    def close(self):
+        """Sync and close the journal"""
+        if self.journal is not None:
+            self.journal.close()
+    
+    def print_portfolio_summary(self):
+        """
+        Print formatted portfolio summary
+        """
+        summary = self.get_portfolio_summary()
+        
+        print("\n" + "="*70)
+        print("PORTFOLIO SUMMARY")
+        print("="*70)
+        print(f"Total Trades:          {summary['total_trades']}")
+        print(f"  • Proposed:          {summary['proposed']}")
+        print(f"  • Executed:          {summary['executed']}")
+        print(f"  • Closed:            {summary['closed']}")
+        print(f"\nTotal Notional:        ${summary['total_notional']:,.0f}")
+        print(f"Average Trade Size:    ${summary['avg_trade_size']:,.0f}")
+        print(f"Total P&L (Closed):    ${summary['total_pnl']:,.2f}")
+        print(f"Unrealized P&L (MTM):  ${summary['unrealized_pnl']:,.2f}")
+        print("="*70 + "\n")
+
+
+# Example usage
+def main(journal_dir=None):
+    """
+    Book, execute and close sample trades and export the blotter
+    
+    journal_dir: also persist the trades to a journal in this directory
+    """
+    tms = TradeManagementSystem(journal_dir=journal_dir)
+    
+    # Book some trades
+    print("Booking trades...\n")
+    
+    trade1 = tms.book_directional_trade(
+        counterparty="China Steel Corp",
+        metal="Copper",
+        direction="Long",
+        entry_price=8650,
+        notional=1000000,
+        target_price=9200,
+        stop_price=8400,
+        rationale="China PMI recovery + weaker USD outlook"
+    )
+    
+    trade2 = tms.book_spread_trade(
+        counterparty="Mumbai Metals Ltd",
+        long_metal="Copper",
+        short_metal="Aluminum",
+        entry_ratio=3.76,
+        notional=500000,
+        target_ratio=4.00,
+        stop_ratio=3.60,
+        rationale="Infrastructure theme favors copper over aluminum"
+    )
+    
+    trade3 = tms.book_directional_trade(
+        counterparty="Tokyo Trading Co",
+        metal="Gold",
+        direction="Long",
+        entry_price=2050,
+        notional=750000,
+        target_price=2100,
+        rationale="Safe haven demand on rate cut expectations"
+    )
+    
+    # Execute trades
+    print("\nExecuting trades...\n")
+    tms.execute_trade(trade1)
+    tms.execute_trade(trade2)
+    
+    # Close a trade
+    print("\nClosing trades...\n")
+    tms.close_trade(trade1, exit_price_or_ratio=8950)
+    
+    # Portfolio summary
+    tms.print_portfolio_summary()
+    
+    # Trade blotter
+    print("TRADE BLOTTER")
+    print("="*70)
+    blotter = tms.generate_trade_blotter()
+    print(blotter.to_string(index=False))
+    
+    # Export
+    tms.export_trades_to_csv()
+    
+    # Save trade history
+    with open('trade_history.json', 'w') as f:
+        json.dump(list(tms.trade_history), f, indent=2)
+    print("\n✓ Saved trade history to trade_history.json")
+    
+    tms.close()
+    return tms
+
+
+if __name__ == "__main__":
+    main()
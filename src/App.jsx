@@ -1,7 +1,7 @@
-import MetalsPlatform from './MetalsPlatform'
-
-function App() {
-  return <MetalsPlatform />
-}
-
-export default App
+import MetalsPlatform from './MetalsPlatform'
+
+function App() {
+  return <MetalsPlatform />
+}
+
+export default App